@@ -0,0 +1,451 @@
+"""Benchmark cases: the `sql.*` functions and the routes.
+
+Each case is a dict with a "name" and a "run" function (the timed part).
+Cases that write may have a "setup" (creates what the case needs, its return
+value is passed to "run") and a "cleanup" (puts the database back as it was),
+neither of which is timed. "heavy" cases read whole tables and run with fewer
+iterations."""
+
+# pylint: disable=import-error
+
+
+from io import BytesIO
+from uuid import uuid4
+from sqlalchemy import text
+from commands.seed import SEED_PASSWORD
+from db import db
+from sql import (
+    exports, genres, imports, migrations, movies, ratings, search, stats, users, validators)
+from sql.seed import SEED_USERNAME_PATTERN
+from utils.pagination import encode_cursor
+
+
+# sql functions (or modules) that are deliberately not benchmarked
+SKIPPED_FUNCTIONS = {
+    "migrations.apply_migration": "runs schema changes",
+    "seed": "seeding tool, timed by --seed"
+}
+
+SAMPLE_SIZE = 50
+
+BENCH_COMMENT = "Benchmark review."
+
+
+def load_fixtures() -> dict:
+    """Function to pick the IDs & values the cases work with from the seeded data.
+
+    Returns:
+        dict: Fixtures ("popular_movie_id", "movie_ids", "user_id"...).
+    """
+    def column(sql: str, **params) -> list:
+        return [str(row[0]) for row in db.session.execute(text(sql), params).fetchall()]
+
+    popular = db.session.execute(text("""
+        SELECT movies.id, movies.title, movies.genre_id
+        FROM movie_stats JOIN movies ON movies.id = movie_stats.movie_id
+        ORDER BY movie_stats.review_count DESC, movies.id LIMIT 1
+    """)).fetchone()
+    median = db.session.execute(text("""
+        SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id
+        FROM movie_stats JOIN movies ON movies.id = movie_stats.movie_id
+        ORDER BY movie_stats.review_count DESC, movies.id
+        OFFSET (SELECT COUNT(*) / 2 FROM movies) LIMIT 1
+    """)).fetchone()
+    user = db.session.execute(text("""
+        SELECT users.id, users.username
+        FROM users JOIN reviews ON reviews.user_id = users.id
+        WHERE users.username ~ :pattern
+        GROUP BY users.id ORDER BY COUNT(*) DESC, users.id LIMIT 1
+    """), {"pattern": SEED_USERNAME_PATTERN}).fetchone()
+
+    admin = db.session.execute(text(
+        "SELECT id, username FROM users WHERE is_admin ORDER BY username LIMIT 1")).fetchone()
+
+    if popular is None or median is None or user is None or admin is None:
+        raise RuntimeError("The database has no benchmark data, run with --seed first.")
+
+    # 50th movie of the title order, where the second page of the index starts
+    page_end = db.session.execute(text(
+        "SELECT title, id FROM movies ORDER BY title, id OFFSET 49 LIMIT 1")).fetchone()
+
+    fixtures = {
+        "popular_movie_id": str(popular[0]),
+        "median_movie": {
+            "id": str(median[0]),
+            "title": median[1],
+            "description": median[2],
+            "year": median[3],
+            "genre": str(median[4])
+        },
+        "genre_id": str(popular[2]),
+        "movie_ids": column(
+            "SELECT id FROM movies ORDER BY md5(id::TEXT) LIMIT :limit", limit=SAMPLE_SIZE),
+        "user_id": str(user[0]),
+        "username": user[1],
+        "user_ids": column(
+            "SELECT id FROM users ORDER BY md5(id::TEXT) LIMIT :limit", limit=SAMPLE_SIZE),
+        "admin_id": str(admin[0]),
+        "admin_username": admin[1],
+        "rating_ids": column(
+            "SELECT id FROM reviews WHERE movie_id = :movie_id ORDER BY id LIMIT :limit",
+            movie_id=str(popular[0]), limit=SAMPLE_SIZE),
+        "index_cursor": encode_cursor(page_end[0], str(page_end[1])),
+        "title_query": "robots",
+        "text_query": "pirates heist"
+    }
+
+    handle = search.save_search_results(fixtures["movie_ids"])
+
+    if not handle["success"]:
+        raise RuntimeError(handle["error"])
+
+    fixtures["search_handle"] = handle["data"]
+
+    return fixtures
+
+
+def execute(sql: str, **params) -> object:
+    """Function to run a setup or cleanup statement and commit.
+
+    Args:
+        sql (str): Statement.
+        **params: Bind parameters.
+
+    Returns:
+        object: First column of the first row, if the statement returns rows.
+    """
+    result = db.session.execute(text(sql), params)
+    value = result.scalar() if result.returns_rows else None
+    db.session.commit()
+
+    return value
+
+
+def insert_movie(fixtures: dict) -> str:
+    """Function to insert a throwaway movie (setup of the delete cases).
+
+    Args:
+        fixtures (dict): Fixtures.
+
+    Returns:
+        str: ID of the movie.
+    """
+    return str(execute(
+        """
+        INSERT INTO movies (title, description, year, genre_id, created_by)
+        VALUES (:title, 'Benchmark movie.', 2000, :genre_id, :user_id) RETURNING id
+        """,
+        title=f"Bench {uuid4()}", genre_id=fixtures["genre_id"], user_id=fixtures["admin_id"]))
+
+
+def insert_rating(fixtures: dict) -> str:
+    """Function to insert a throwaway rating by the admin (setup of the delete cases).
+
+    Args:
+        fixtures (dict): Fixtures.
+
+    Returns:
+        str: ID of the rating.
+    """
+    return str(execute(
+        """
+        INSERT INTO reviews (user_id, movie_id, rating, comment)
+        VALUES (:user_id, :movie_id, 5, :comment) RETURNING id
+        """,
+        user_id=fixtures["admin_id"], movie_id=fixtures["median_movie"]["id"],
+        comment=BENCH_COMMENT))
+
+
+def delete_bench_movies(*_) -> None:
+    """Function to delete the movies added by the cases."""
+    execute("DELETE FROM movies WHERE title LIKE 'Bench %'")
+
+
+def delete_admin_ratings(fixtures: dict, *_) -> None:
+    """Function to delete the ratings added by the cases.
+
+    Args:
+        fixtures (dict): Fixtures.
+    """
+    execute(
+        "DELETE FROM reviews WHERE user_id = :user_id AND comment = :comment",
+        user_id=fixtures["admin_id"], comment=BENCH_COMMENT)
+
+
+def delete_registered_users(*_) -> None:
+    """Function to delete the users registered by the cases."""
+    # a regular expression, in LIKE "_" would match any character
+    execute("DELETE FROM users WHERE username ~ '^bench_new_'")
+
+
+def consume(result: object) -> object:
+    """Function to read a streamed result to the end (part of the timed work).
+
+    Args:
+        result (object): Return value of a sql function.
+
+    Returns:
+        object: The same result.
+    """
+    if isinstance(result, dict) and hasattr(result.get("data"), "__next__"):
+        for _ in result["data"]:
+            pass
+
+    return result
+
+
+def ratings_page_two_after(fixtures: dict, sort: str) -> tuple:
+    """Function to get the sort key that the second page of the popular movie's reviews
+    starts after.
+
+    Args:
+        fixtures (dict): Fixtures.
+        sort (str): Review order.
+
+    Returns:
+        tuple: Sort key of the last review on the first page.
+    """
+    first = ratings.get_movie_ratings_page(fixtures["popular_movie_id"], sort, None, 20)
+
+    return ratings.review_sort_key(first["data"][-1], sort)
+
+
+def function_cases(fixtures: dict) -> list[dict]:
+    """Function to list the cases of the `sql.*` functions.
+
+    Cases run in a request context with the bench user logged in ("session"
+    in the case overrides the user). Names are "<module>.<function>", with a
+    variant in brackets when a function has several cases.
+
+    Args:
+        fixtures (dict): Fixtures.
+
+    Returns:
+        list[dict]: Cases.
+    """
+    f = fixtures
+    popular = f["popular_movie_id"]
+    median = f["median_movie"]
+    admin_session = {"user_id": f["admin_id"], "username": f["admin_username"], "is_admin": True}
+
+    return [
+        # movies
+        {"name": "movies.get_all_movies[page]",
+         "run": lambda _: movies.get_all_movies(limit=51)},
+        {"name": "movies.get_all_movies[page, after]",
+         "run": lambda _: movies.get_all_movies(
+             after=(median["title"], median["id"]), limit=51)},
+        {"name": "movies.get_all_movies[page, reviews]",
+         "run": lambda _: movies.get_all_movies(include_reviews=True, limit=51)},
+        {"name": "movies.get_all_movies[all]", "heavy": True,
+         "run": lambda _: movies.get_all_movies()},
+        {"name": "movies.get_movie_by_id[popular]",
+         "run": lambda _: movies.get_movie_by_id(popular)},
+        {"name": "movies.get_movie_by_id[median]",
+         "run": lambda _: movies.get_movie_by_id(median["id"])},
+        {"name": "movies.get_movie_header_by_id",
+         "run": lambda _: movies.get_movie_header_by_id(popular)},
+        {"name": "movies.get_movie_detail_by_id",
+         "run": lambda _: movies.get_movie_detail_by_id(popular)},
+        {"name": "movies.get_movies_by_ids",
+         "run": lambda _: movies.get_movies_by_ids(f["movie_ids"])},
+        {"name": "movies.get_movies_by_ids[reviews]",
+         "run": lambda _: movies.get_movies_by_ids(f["movie_ids"], include_reviews=True)},
+        {"name": "search.search_movie_ids",
+         "run": lambda _: search.search_movie_ids(f["title_query"], None, 100)},
+        {"name": "search.search_movie_ids[genre]",
+         "run": lambda _: search.search_movie_ids(f["title_query"], f["genre_id"], 100)},
+        {"name": "search.search_movies_full_text",
+         "run": lambda _: search.search_movies_full_text(f["text_query"], None, 21, 0)},
+        {"name": "search.search_movies_full_text[page 5]",
+         "run": lambda _: search.search_movies_full_text(f["text_query"], None, 21, 80)},
+        {"name": "movies.add_movie",
+         "run": lambda _: movies.add_movie(
+             f"Bench {uuid4()}", f["genre_id"], "Benchmark movie.", 2000, f["admin_id"]),
+         "cleanup": delete_bench_movies},
+        {"name": "movies.delete_movie_by_id", "session": admin_session,
+         "setup": lambda: insert_movie(f),
+         "run": lambda movie_id: movies.delete_movie_by_id(movie_id, f["admin_id"], True)},
+        {"name": "movies.edit_movie_by_id",
+         "run": lambda _: movies.edit_movie_by_id(
+             median["id"], median["title"], median["genre"],
+             median["description"], median["year"])},
+        {"name": "ratings.rate_movie", "session": admin_session,
+         "run": lambda _: ratings.rate_movie(median["id"], 7, BENCH_COMMENT, f["admin_id"]),
+         "cleanup": lambda _: delete_admin_ratings(f)},
+        {"name": "ratings.rate_movie[upsert]", "session": admin_session,
+         "setup": lambda: insert_rating(f),
+         "run": lambda _: ratings.rate_movie(
+             median["id"], 8, BENCH_COMMENT, f["admin_id"], True),
+         "cleanup": lambda _: delete_admin_ratings(f)},
+        {"name": "ratings.get_movie_ratings_by_id[popular]",
+         "run": lambda _: ratings.get_movie_ratings_by_id(popular)},
+        {"name": "ratings.get_movie_ratings_page[newest]",
+         "run": lambda _: ratings.get_movie_ratings_page(popular, "newest")},
+        {"name": "ratings.get_movie_ratings_page[highest]",
+         "run": lambda _: ratings.get_movie_ratings_page(popular, "highest")},
+        {"name": "ratings.get_movie_ratings_page[newest, page 2]",
+         "setup": lambda: ratings_page_two_after(f, "newest"),
+         "run": lambda after: ratings.get_movie_ratings_page(popular, "newest", after)},
+        {"name": "ratings.get_ratings_by_movie_ids",
+         "run": lambda _: ratings.get_ratings_by_movie_ids(f["movie_ids"])},
+        {"name": "ratings.get_rated_movie_ids",
+         "run": lambda _: ratings.get_rated_movie_ids(f["user_id"])},
+        {"name": "ratings.get_rating_by_id",
+         "run": lambda _: ratings.get_rating_by_id(f["rating_ids"][0])},
+        {"name": "ratings.get_user_movie_rating",
+         "run": lambda _: ratings.get_user_movie_rating(popular, f["user_id"])},
+        {"name": "ratings.get_ratings_by_ids",
+         "run": lambda _: ratings.get_ratings_by_ids(f["rating_ids"])},
+        {"name": "ratings.delete_rating_by_id", "session": admin_session,
+         "setup": lambda: insert_rating(f),
+         "run": lambda rating_id: ratings.delete_rating_by_id(rating_id, True)},
+        {"name": "stats.rebuild_movie_stats", "heavy": True,
+         "run": lambda _: stats.rebuild_movie_stats()},
+        {"name": "exports.stream_movies", "heavy": True,
+         "run": lambda _: consume(exports.stream_movies())},
+        {"name": "exports.stream_movie_ratings_by_id[popular]",
+         "run": lambda _: consume(exports.stream_movie_ratings_by_id(popular))},
+        {"name": "imports.import_movies[100]",
+         "run": lambda _: imports.import_movies([
+             {"title": f"Bench {uuid4()}", "genre": f["genre_id"],
+              "description": "Benchmark movie.", "year": 2000} for _ in range(100)
+         ], f["admin_id"]),
+         "cleanup": delete_bench_movies},
+        # users
+        {"name": "users.get_user_by_id",
+         "run": lambda _: users.get_user_by_id(f["user_id"])},
+        {"name": "users.get_users_by_ids",
+         "run": lambda _: users.get_users_by_ids(f["user_ids"])},
+        {"name": "users.get_user_id_by_username",
+         "run": lambda _: users.get_user_id_by_username(f["username"])},
+        {"name": "users.register",
+         "run": lambda _: users.register(f"bench_new_{uuid4().hex[:12]}", SEED_PASSWORD),
+         "cleanup": delete_registered_users},
+        {"name": "users.login",
+         "run": lambda _: users.login(f["username"], SEED_PASSWORD)},
+        # genres
+        {"name": "genres.load_genre_cache",
+         "run": lambda _: genres.load_genre_cache()},
+        {"name": "genres.get_all_genres",
+         "run": lambda _: genres.get_all_genres()},
+        {"name": "genres.get_genre_ids",
+         "run": lambda _: genres.get_genre_ids()},
+        {"name": "genres.get_genre_names_by_id",
+         "run": lambda _: genres.get_genre_names_by_id()},
+        {"name": "genres.fetch_all_genres",
+         "run": lambda _: genres.fetch_all_genres()},
+        # search
+        {"name": "search.save_search_results",
+         "run": lambda _: search.save_search_results(f["movie_ids"])},
+        {"name": "search.get_search_results",
+         "run": lambda _: search.get_search_results(f["search_handle"])},
+        # validators
+        {"name": "validators.get_movie_list_validator",
+         "run": lambda _: validators.get_movie_list_validator(None, 51)},
+        {"name": "validators.get_movie_validator",
+         "run": lambda _: validators.get_movie_validator(popular)},
+        {"name": "validators.get_movies_validator",
+         "run": lambda _: validators.get_movies_validator(f["movie_ids"])},
+        # exports
+        {"name": "exports.stream_export[movies]", "heavy": True,
+         "run": lambda _: consume(exports.stream_export("movies"))},
+        {"name": "exports.stream_export[reviews]", "heavy": True,
+         "run": lambda _: consume(exports.stream_export("reviews"))},
+        {"name": "exports.copy_export_csv[movies]", "heavy": True,
+         "run": lambda _: exports.copy_export_csv("movies", BytesIO())},
+        {"name": "exports.copy_export_csv[reviews]", "heavy": True,
+         "run": lambda _: exports.copy_export_csv("reviews", BytesIO())},
+        # migrations
+        {"name": "migrations.get_applied_migrations",
+         "run": lambda _: migrations.get_applied_migrations()}
+    ]
+
+
+def route_cases(fixtures: dict) -> list[dict]:
+    """Function to list the cases of the routes.
+
+    "client" is "anonymous", "user" (the bench user with the most reviews)
+    or "admin". "path" & "data" may contain "{value}", which is replaced
+    with the return value of "setup". Names are "<method> <rule>", with a
+    variant in brackets when a route has several cases.
+
+    Args:
+        fixtures (dict): Fixtures.
+
+    Returns:
+        list[dict]: Cases.
+    """
+    f = fixtures
+    popular = f["popular_movie_id"]
+    median = f["median_movie"]
+
+    return [
+        {"name": "GET /[anonymous]", "client": "anonymous", "path": "/"},
+        {"name": "GET /[user]", "client": "user", "path": "/"},
+        {"name": "GET /[after]", "client": "user", "path": f"/?after={f['index_cursor']}"},
+        {"name": "GET /movies/list", "client": "user",
+         "path": f"/movies/list?after={f['index_cursor']}"},
+        {"name": "GET /movies", "client": "user", "path": "/movies"},
+        {"name": "GET /movies/<id>[popular, anonymous]", "client": "anonymous",
+         "path": f"/movies/{popular}"},
+        {"name": "GET /movies/<id>[popular, user]", "client": "user",
+         "path": f"/movies/{popular}"},
+        {"name": "GET /movies/<id>[median, user]", "client": "user",
+         "path": f"/movies/{median['id']}"},
+        {"name": "GET /movies/<id>/reviews", "client": "user",
+         "path": f"/movies/{popular}/reviews?sort=highest"},
+        {"name": "GET /movies/add", "client": "user", "path": "/movies/add"},
+        {"name": "GET /movies/rate/<id>", "client": "user", "path": f"/movies/rate/{popular}"},
+        {"name": "GET /movies/edit/<id>", "client": "admin", "path": f"/movies/edit/{popular}"},
+        {"name": "POST /api/movies", "client": "admin", "method": "POST",
+         "path": "/api/movies",
+         "data": {"title": "Bench {value}", "genre": f["genre_id"],
+                  "description": "Benchmark movie.", "year": "2000"},
+         "setup": lambda: uuid4().hex, "cleanup": delete_bench_movies},
+        {"name": "POST /api/movies/<id>", "client": "admin", "method": "POST",
+         "path": "/api/movies/{value}", "setup": lambda: insert_movie(f)},
+        {"name": "POST /api/movies/edit/<id>", "client": "admin", "method": "POST",
+         "path": f"/api/movies/edit/{median['id']}",
+         "data": {"title": median["title"], "genre": median["genre"],
+                  "description": median["description"], "year": str(median["year"])}},
+        {"name": "PUT /api/movies/edit/<id>", "client": "admin", "method": "PUT",
+         "path": f"/api/movies/edit/{median['id']}",
+         "data": {"title": median["title"], "genre": median["genre"],
+                  "description": median["description"], "year": str(median["year"])}},
+        {"name": "POST /api/movies/rate/<id>", "client": "admin", "method": "POST",
+         "path": f"/api/movies/rate/{median['id']}",
+         "data": {"rating": "7", "comment": BENCH_COMMENT},
+         "cleanup": lambda _: delete_admin_ratings(f)},
+        {"name": "POST /api/movies/rate/delete/<id>", "client": "admin", "method": "POST",
+         "path": "/api/movies/rate/delete/{value}", "setup": lambda: insert_rating(f)},
+        {"name": "GET /search", "client": "user", "path": "/search"},
+        {"name": "GET /search/results/", "client": "user", "path": "/search/results/"},
+        {"name": "GET /search/results/<results>", "client": "user",
+         "path": f"/search/results/{','.join(f['movie_ids'])}"},
+        {"name": "GET /search/handle/<handle>", "client": "user",
+         "path": f"/search/handle/{f['search_handle']}"},
+        {"name": "GET /search/text", "client": "user", "path": f"/search/text?q={f['text_query']}"},
+        {"name": "POST /api/search[title]", "client": "user", "method": "POST",
+         "path": "/api/search", "data": {"title": f["title_query"]}},
+        {"name": "POST /api/search[title, genre]", "client": "user", "method": "POST",
+         "path": "/api/search", "data": {"title": f["title_query"], "genre": f["genre_id"]}},
+        {"name": "GET /profile", "client": "user", "path": "/profile"},
+        {"name": "GET /auth/login", "client": "anonymous", "path": "/auth/login"},
+        {"name": "GET /auth/register", "client": "anonymous", "path": "/auth/register"},
+        {"name": "GET /auth/logout", "client": "anonymous", "path": "/auth/logout"},
+        {"name": "POST /api/auth/login", "client": "anonymous", "method": "POST",
+         "path": "/api/auth/login",
+         "data": {"username": f["username"], "password": SEED_PASSWORD}},
+        {"name": "POST /api/auth/register", "client": "anonymous", "method": "POST",
+         "path": "/api/auth/register",
+         "data": {"username": "bench_new_{value}", "password": SEED_PASSWORD},
+         "setup": lambda: uuid4().hex[:12], "cleanup": delete_registered_users},
+        {"name": "GET /api/v1/movies", "client": "anonymous", "path": "/api/v1/movies",
+         "heavy": True},
+        {"name": "GET /api/v1/movies/<id>/reviews[popular]", "client": "anonymous",
+         "path": f"/api/v1/movies/{popular}/reviews"},
+        {"name": "GET /api/admin/db/pool", "client": "admin", "path": "/api/admin/db/pool"},
+        {"name": "GET /api/admin/export/<name>[movies]", "client": "admin",
+         "path": "/api/admin/export/movies", "heavy": True}
+    ]
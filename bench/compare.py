@@ -0,0 +1,96 @@
+"""Compares two benchmark results files (see `run.py`).
+
+Usage (from the repository root):
+
+    python bench/compare.py bench/results/before.json bench/results/after.json
+
+Cases whose p50 or p95 got slower by more than the threshold, or which issue
+more queries than before, are flagged; the exit status is 1 if any are."""
+
+
+import json
+from pathlib import Path
+import click
+
+
+def load_cases(path: Path) -> dict[str, dict]:
+    """Function to read the cases of a results file.
+
+    Args:
+        path (Path): Results file.
+
+    Returns:
+        dict[str, dict]: Results keyed by "<suite>: <case name>".
+    """
+    results = json.loads(path.read_text(encoding="utf-8"))
+
+    return {
+        f"{suite}: {name}": result
+        for suite in ("functions", "routes")
+        for name, result in results.get(suite, {}).items()
+    }
+
+
+def change(before: float, after: float) -> float:
+    """Function to get the relative change between two measurements.
+
+    Args:
+        before (float): Old value.
+        after (float): New value.
+
+    Returns:
+        float: Change in percent.
+    """
+    if before == 0:
+        return 0.0 if after == 0 else float("inf")
+
+    return (after - before) / before * 100
+
+
+@click.command()
+@click.argument("before", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("after", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--threshold", type=float, default=10.0, show_default=True,
+              help="Slowdown (percent) that counts as a regression.")
+def main(before: Path, after: Path, threshold: float) -> None:
+    """Compare the cases of two benchmark runs."""
+    old_cases = load_cases(before)
+    new_cases = load_cases(after)
+    common = [name for name in new_cases if name in old_cases]
+
+    if not common:
+        raise click.ClickException("The files have no cases in common.")
+
+    width = max(len(name) for name in common)
+    regressions = 0
+
+    click.echo(f"{'case':<{width}} {'p50 ms':>19} {'p95 ms':>19} {'queries':>9}")
+
+    for name in common:
+        old, new = old_cases[name], new_cases[name]
+        p50_change = change(old["p50_ms"], new["p50_ms"])
+        p95_change = change(old["p95_ms"], new["p95_ms"])
+
+        regressed = (p50_change > threshold or p95_change > threshold
+                     or new["queries"] > old["queries"])
+        regressions += regressed
+
+        click.echo(
+            f"{name:<{width}} {new['p50_ms']:>10.2f} {p50_change:>+7.1f}% "
+            f"{new['p95_ms']:>10.2f} {p95_change:>+7.1f}% "
+            f"{old['queries']:>4g}>{new['queries']:<4g}"
+            + ("  REGRESSION" if regressed else ""))
+
+    only_before = len(set(old_cases) - set(new_cases))
+    only_after = len(set(new_cases) - set(old_cases))
+
+    if only_before or only_after:
+        click.echo(f"\n{only_before} case(s) only in {before}, {only_after} only in {after}.")
+
+    if regressions:
+        click.echo(f"\n{regressions} regression(s) over {threshold:g}%.")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
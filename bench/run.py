@@ -0,0 +1,539 @@
+"""Benchmark runner for the `sql` package and the routes.
+
+Times every case of `cases.py` against a dedicated database and writes the
+results (p50/p95 latency, query counts, peak memory) as JSON to
+`bench/results`. Compare two runs with `compare.py`.
+
+Usage (from the repository root):
+
+    BENCH_DATABASE_URI=postgresql://... python bench/run.py --seed --scale small
+
+The database in `BENCH_DATABASE_URI` must have the schema of `db/init-db.sh` & `db/migrations`.
+`--seed` tops it up with `flask seed` data (`--reset` deletes the seeded data
+first), so better not point it at real data."""
+
+# pylint: disable=import-error
+# pylint: disable=import-outside-toplevel
+
+
+import importlib
+import inspect
+import json
+import math
+import pkgutil
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from os import environ, urandom
+from pathlib import Path
+from statistics import mean, median
+from time import perf_counter
+from typing import Callable
+import click
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+RESULTS_DIR = BENCH_DIR / "results"
+
+# iterations of the cases that read whole tables
+HEAVY_ITERATIONS = 3
+
+CSRF_TOKEN = urandom(16).hex()
+
+# amounts of seeded data (see `flask seed`)
+SCALES = {
+    "tiny": {"movies": 1_000, "users": 5_000, "reviews": 50_000},
+    "small": {"movies": 10_000, "users": 50_000, "reviews": 500_000},
+    "full": {"movies": 50_000, "users": 500_000, "reviews": 5_000_000}
+}
+
+
+def configure_environment() -> None:
+    """Function to point the app at the benchmark database (before it's imported)."""
+    if not environ.get("BENCH_DATABASE_URI"):
+        raise click.ClickException(
+            "Set BENCH_DATABASE_URI to a database that may be wiped for the benchmarks.")
+
+    environ["SQLALCHEMY_DATABASE_URI"] = environ["BENCH_DATABASE_URI"]
+    environ.setdefault("SECRET_KEY", urandom(16).hex())
+    # keep the per-request log lines out of the progress output
+    environ.setdefault("SQL_LOG_LEVEL", "WARNING")
+
+    sys.path[:0] = [str(SRC_DIR), str(BENCH_DIR)]
+
+
+class QueryCounter:
+    """Counts the statements sent to the database."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *_) -> None:
+        self.count += 1
+
+    def reset(self) -> None:
+        """Function to start counting from zero."""
+        self.count = 0
+
+
+def clear_caches() -> None:
+    """Function to empty all in-process caches, so that every iteration hits the database."""
+    from sql.genres import invalidate_genre_cache
+    from sql.ratings import rated_movies_cache
+    from sql.users import user_cache
+    from utils.page_cache import page_cache
+
+    invalidate_genre_cache()
+    rated_movies_cache.clear()
+    user_cache.clear()
+    page_cache.clear()
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Function to get a percentile (nearest-rank method).
+
+    Args:
+        values (list[float]): Measurements.
+        percent (float): Percentile (0-100).
+
+    Returns:
+        float: Value at the percentile.
+    """
+    ordered = sorted(values)
+
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def case_error(result: object) -> str | None:
+    """Function to get the error of a failed sql function call.
+
+    Args:
+        result (object): Return value of the function.
+
+    Returns:
+        str | None: Error message, or None if the call didn't fail.
+    """
+    if isinstance(result, dict) and result.get("success") is False:
+        return str(result.get("error"))
+
+    return None
+
+
+def timed(run: Callable[[], object], counter: QueryCounter, trace_memory: bool) -> tuple:
+    """Function to run & measure the timed part of a case.
+
+    Args:
+        run (Callable[[], object]): Timed part.
+        counter (QueryCounter): Query counter of the engine.
+        trace_memory (bool): Whether to trace memory allocations (slows the call down).
+
+    Returns:
+        tuple: Return value, seconds, amount of queries & peak memory in bytes (or None).
+    """
+    peak = None
+    counter.reset()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = perf_counter()
+    result = run()
+    elapsed = perf_counter() - start
+
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, elapsed, counter.count, peak
+
+
+def run_function_once(
+        case: dict,
+        fixtures: dict,
+        counter: QueryCounter,
+        warm: bool,
+        trace_memory: bool) -> tuple:
+    """Function to run a sql function case once, in a request context of its own.
+
+    Args:
+        case (dict): Case.
+        fixtures (dict): Fixtures.
+        counter (QueryCounter): Query counter of the engine.
+        warm (bool): Whether to keep the in-process caches.
+        trace_memory (bool): Whether to trace memory allocations.
+
+    Returns:
+        tuple: Seconds, amount of queries, peak memory (or None) & error (or None).
+    """
+    from flask import session
+    from app import app
+
+    with app.test_request_context():
+        session.update(case.get("session", {
+            "user_id": fixtures["user_id"],
+            "username": fixtures["username"],
+            "is_admin": False
+        }))
+
+        value = case["setup"]() if "setup" in case else None
+
+        if not warm:
+            clear_caches()
+
+        result, elapsed, queries, peak = timed(
+            lambda: case["run"](value), counter, trace_memory)
+
+        if "cleanup" in case:
+            case["cleanup"](value)
+
+    return elapsed, queries, peak, case_error(result)
+
+
+def run_route_once(
+        case: dict,
+        fixtures: dict,
+        counter: QueryCounter,
+        warm: bool,
+        trace_memory: bool) -> tuple:
+    """Function to request a route once, with a fresh test client.
+
+    Args:
+        case (dict): Case.
+        fixtures (dict): Fixtures.
+        counter (QueryCounter): Query counter of the engine.
+        warm (bool): Whether to keep the in-process caches.
+        trace_memory (bool): Whether to trace memory allocations.
+
+    Returns:
+        tuple: Seconds, amount of queries, peak memory (or None) & error (or None).
+    """
+    from app import app
+
+    client = app.test_client()
+    users = {
+        "user": (fixtures["user_id"], fixtures["username"], False),
+        "admin": (fixtures["admin_id"], fixtures["admin_username"], True)
+    }
+
+    if case.get("client", "anonymous") in users:
+        user_id, username, is_admin = users[case["client"]]
+
+        with client.session_transaction() as session:
+            session.update({
+                "user_id": user_id,
+                "username": username,
+                "is_admin": is_admin,
+                "csrf_token": CSRF_TOKEN
+            })
+
+    with app.app_context():
+        value = case["setup"]() if "setup" in case else None
+
+    path = case["path"].replace("{value}", str(value))
+    data = {key: item.replace("{value}", str(value))
+            for key, item in case.get("data", {}).items()}
+
+    if case.get("method", "GET") != "GET":
+        data["csrf_token"] = CSRF_TOKEN
+
+    if not warm:
+        clear_caches()
+
+    def request() -> object:
+        response = client.open(path, method=case.get("method", "GET"), data=data)
+        # streamed responses are read to the end
+        response.get_data()
+        response.close()
+
+        return response
+
+    response, elapsed, queries, peak = timed(request, counter, trace_memory)
+
+    if "cleanup" in case:
+        with app.app_context():
+            case["cleanup"](value)
+
+    error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+
+    return elapsed, queries, peak, error
+
+
+def measure(run_once: Callable, case: dict, iterations: int) -> dict:
+    """Function to measure a case.
+
+    The first run only warms up (compiled statements, templates...). Memory is
+    traced in one extra run, so that tracing doesn't skew the timings.
+
+    Args:
+        run_once (Callable): `run_function_once` or `run_route_once`, other arguments bound.
+        case (dict): Case.
+        iterations (int): Amount of timed runs.
+
+    Returns:
+        dict: Results of the case.
+    """
+    if case.get("heavy"):
+        iterations = min(iterations, HEAVY_ITERATIONS)
+
+    timings = []
+    queries = []
+    errors = set()
+
+    for iteration in range(iterations + 1):
+        elapsed, count, _, error = run_once(case, trace_memory=False)
+
+        if error is not None:
+            errors.add(error)
+
+        if iteration > 0:
+            timings.append(elapsed * 1000)
+            queries.append(count)
+
+    _, _, peak, _ = run_once(case, trace_memory=True)
+
+    result = {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(mean(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "queries": median(queries),
+        "max_queries": max(queries),
+        "peak_memory_kib": round(peak / 1024, 1)
+    }
+
+    if errors:
+        result["errors"] = sorted(errors)
+
+    return result
+
+
+def uncovered_functions(cases: list[dict], skipped: dict[str, str]) -> dict[str, str]:
+    """Function to list the sql functions that no case covers.
+
+    Every function of the `sql` package returning an `SQLOperationResult` is expected
+    to have a case.
+
+    Args:
+        cases (list[dict]): Function cases.
+        skipped (dict[str, str]): Deliberately skipped functions (or whole modules)
+        with the reason.
+
+    Returns:
+        dict[str, str]: Function name -> reason it wasn't benchmarked.
+    """
+    from structs import SQLOperationResult
+
+    covered = {case["name"].split("[")[0] for case in cases}
+    missing = {}
+
+    for module_info in pkgutil.iter_modules([str(SRC_DIR / "sql")]):
+        module = importlib.import_module(f"sql.{module_info.name}")
+
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            full_name = f"{module_info.name}.{name}"
+
+            if function.__module__ != module.__name__ or full_name in covered:
+                continue
+
+            if inspect.signature(function).return_annotation is SQLOperationResult:
+                missing[full_name] = skipped.get(
+                    full_name, skipped.get(module_info.name, "no case"))
+
+    return missing
+
+
+def uncovered_routes(cases: list[dict]) -> dict[str, str]:
+    """Function to list the routes that no case covers.
+
+    Args:
+        cases (list[dict]): Route cases.
+
+    Returns:
+        dict[str, str]: "<method> <rule>" -> reason it wasn't benchmarked.
+    """
+    from app import app
+
+    covered = {case["name"].split("[")[0] for case in cases}
+    missing = {}
+
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static":
+            continue
+
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+            if f"{method} {rule.rule}" not in covered:
+                missing[f"{method} {rule.rule}"] = "no case"
+
+    return missing
+
+
+def git_revision() -> str | None:
+    """Function to get the checked out commit (with "-dirty" for uncommitted changes).
+
+    Returns:
+        str | None: Revision, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=BENCH_DIR, check=True,
+            capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(title: str, results: dict[str, dict]) -> None:
+    """Function to print the results of a suite as a table.
+
+    Args:
+        title (str): Suite name.
+        results (dict[str, dict]): Results keyed by case name.
+    """
+    width = max([len(name) for name in results] + [len(title)])
+
+    click.echo(f"\n{title:<{width}} {'p50 ms':>10} {'p95 ms':>10} {'queries':>8} {'peak KiB':>10}")
+
+    for name, result in results.items():
+        line = (f"{name:<{width}} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+                f"{result['queries']:>8g} {result['peak_memory_kib']:>10.1f}")
+
+        if "errors" in result:
+            line += f"  ERROR: {'; '.join(result['errors'])}"
+
+        click.echo(line)
+
+
+@click.command()
+@click.option("--seed", "seed_first", is_flag=True,
+              help="Seed the database with `flask seed` first.")
+@click.option("--reset", is_flag=True, help="Delete the seeded data before seeding.")
+@click.option("--scale", type=click.Choice(["tiny", "small", "full"]), default="small",
+              show_default=True, help="Amount of data to seed.")
+@click.option("--movies", type=int, help="Amount of movies to seed (overrides --scale).")
+@click.option("--users", type=int, help="Amount of users to seed (overrides --scale).")
+@click.option("--reviews", type=int, help="Amount of reviews to seed (overrides --scale).")
+@click.option("--iterations", type=int, default=20, show_default=True,
+              help="Timed runs per case.")
+@click.option("--suite", type=click.Choice(["all", "functions", "routes"]), default="all",
+              show_default=True, help="Cases to run.")
+@click.option("--only", multiple=True, help="Only run the cases whose name contains this.")
+@click.option("--warm", is_flag=True,
+              help="Keep the in-process caches between runs (default: cleared before each run).")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path),
+              help="Results file. Defaults to bench/results/<timestamp>.json.")
+def main(
+        seed_first: bool,
+        reset: bool,
+        scale: str,
+        movies: int | None,
+        users: int | None,
+        reviews: int | None,
+        iterations: int,
+        suite: str,
+        only: tuple[str, ...],
+        warm: bool,
+        output: Path | None) -> None:
+    """Benchmark the sql functions and the routes."""
+    configure_environment()
+
+    from functools import partial
+    from sqlalchemy import event, text
+    from app import app
+    from db import db
+    from sql.seed import get_seed_counts
+    import cases
+
+    started_at = datetime.now(timezone.utc)
+
+    with app.app_context():
+        if seed_first:
+            counts = dict(SCALES[scale])
+
+            for table, amount in (("movies", movies), ("users", users), ("reviews", reviews)):
+                if amount is not None:
+                    counts[table] = amount
+
+            args = ["seed"] + [f"--{table}={amount}" for table, amount in counts.items()]
+            start = perf_counter()
+            seeded = app.test_cli_runner().invoke(args=args + (["--reset"] if reset else []))
+            click.echo(seeded.output, nl=False)
+
+            if seeded.exit_code != 0:
+                raise click.ClickException("Seeding failed.")
+
+            # fresh statistics for the planner
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            click.echo(f"Seeded in {perf_counter() - start:.1f}s.")
+
+        rows = get_seed_counts()["data"]
+
+        fixtures = cases.load_fixtures()
+        server_version = db.session.execute(text("SHOW server_version")).scalar()
+
+        counter = QueryCounter()
+        event.listen(db.engine, "before_cursor_execute", counter)
+
+    suites = {
+        "functions": (cases.function_cases(fixtures), run_function_once),
+        "routes": (cases.route_cases(fixtures), run_route_once)
+    }
+
+    results = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "postgres": server_version,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "caches": "warm" if warm else "cold",
+            "rows": rows
+        }
+    }
+
+    not_benchmarked = {}
+
+    for name, (suite_cases, run_once) in suites.items():
+        if suite not in ("all", name):
+            continue
+
+        if name == "functions":
+            with app.app_context():
+                not_benchmarked.update(
+                    uncovered_functions(suite_cases, cases.SKIPPED_FUNCTIONS))
+        else:
+            not_benchmarked.update(uncovered_routes(suite_cases))
+
+        results[name] = {}
+
+        for case in suite_cases:
+            if only and not any(part in case["name"] for part in only):
+                continue
+
+            click.echo(f"{case['name']}...", err=True)
+            results[name][case["name"]] = measure(
+                partial(run_once, fixtures=fixtures, counter=counter, warm=warm),
+                case, iterations)
+
+        print_results(name, results[name])
+
+    results["not_benchmarked"] = not_benchmarked
+
+    for name, reason in not_benchmarked.items():
+        click.echo(f"Not benchmarked: {name} ({reason})", err=True)
+
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    click.echo(f"\nResults written to {output}.")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
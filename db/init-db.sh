@@ -50,6 +50,16 @@ psql -v ON_ERROR_STOP=1 --username "postgres" --dbname "rottenpotatoes" <<-EOSQL
         updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL
     );
 
+    -- applied schema migrations (see ../db/migrations & "flask migrate")
+    -- everything added to the schema since lives in the migrations, which are
+    -- applied at the end of this script
+
+    CREATE TABLE schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL
+    );
+
     -- use \$\$ to escape shell expansion
 
     CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -97,3 +107,16 @@ psql -v ON_ERROR_STOP=1 --username "postgres" --dbname "rottenpotatoes" <<-EOSQL
     (uuid_generate_v4(), 'thriller'),
     (uuid_generate_v4(), 'western');
 EOSQL
+
+# apply the schema migrations (mounted at /migrations) and record them as applied
+for migration in /migrations/*.sql; do
+    [ -e "$migration" ] || continue
+
+    file=$(basename "$migration" .sql)
+    version=$((10#${file%%_*}))
+    name=${file#*_}
+
+    psql -v ON_ERROR_STOP=1 --username "postgres" --dbname "rottenpotatoes" --single-transaction \
+        -f "$migration" \
+        -c "INSERT INTO schema_migrations (version, name) VALUES ($version, '$name')"
+done
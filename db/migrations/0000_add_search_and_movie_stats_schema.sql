@@ -0,0 +1,116 @@
+-- title & full-text search indexes, per-movie rating statistics and server-side
+-- search results, for databases created before they existed (fresh databases
+-- get them from here as well). Every statement is safe to run again.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- trigram index for substring (ILIKE) title search
+
+CREATE INDEX IF NOT EXISTS movies_title_trgm_idx ON movies USING GIN (title gin_trgm_ops);
+
+-- full-text search over titles & descriptions (adding the column rewrites the table)
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', title), 'A') ||
+    setweight(to_tsvector('english', description), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS movies_search_vector_idx ON movies USING GIN (search_vector);
+
+-- per-movie rating statistics, maintained by the triggers below
+-- rating_histogram[n] holds the amount of n-star reviews (1-10)
+-- updated_at changes whenever any review of the movie changes
+
+CREATE TABLE IF NOT EXISTS movie_stats (
+    movie_id UUID PRIMARY KEY REFERENCES movies(id) ON DELETE CASCADE,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_average DOUBLE PRECISION GENERATED ALWAYS AS (
+        CASE WHEN review_count > 0 THEN rating_sum::DOUBLE PRECISION / review_count END
+    ) STORED,
+    rating_histogram INT[] NOT NULL DEFAULT array_fill(0, ARRAY[10])
+);
+
+ALTER TABLE movie_stats
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL;
+
+CREATE OR REPLACE FUNCTION create_movie_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO movie_stats (movie_id) VALUES (NEW.id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_movie_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE movie_stats
+        SET review_count = review_count - 1,
+            rating_sum = rating_sum - OLD.rating,
+            rating_histogram[OLD.rating] = rating_histogram[OLD.rating] - 1,
+            updated_at = NOW()
+        WHERE movie_id = OLD.movie_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE movie_stats
+        SET review_count = review_count + 1,
+            rating_sum = rating_sum + NEW.rating,
+            rating_histogram[NEW.rating] = rating_histogram[NEW.rating] + 1,
+            updated_at = NOW()
+        WHERE movie_id = NEW.movie_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER create_movie_stats_movies
+AFTER INSERT ON movies
+FOR EACH ROW
+EXECUTE FUNCTION create_movie_stats();
+
+CREATE OR REPLACE TRIGGER update_movie_stats_reviews
+AFTER INSERT OR DELETE OR UPDATE ON reviews
+FOR EACH ROW
+EXECUTE FUNCTION update_movie_stats();
+
+-- backfill the statistics of existing movies (same as "flask rebuild-movie-stats"),
+-- review writes wait until the migration is committed
+
+LOCK TABLE reviews IN SHARE MODE;
+
+INSERT INTO movie_stats (movie_id, review_count, rating_sum, rating_histogram)
+SELECT movies.id, COUNT(reviews.id), COALESCE(SUM(reviews.rating), 0),
+    CAST(ARRAY[
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 1),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 2),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 3),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 4),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 5),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 6),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 7),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 8),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 9),
+        COUNT(reviews.id) FILTER (WHERE reviews.rating = 10)
+    ] AS INT[])
+FROM movies
+LEFT JOIN reviews ON reviews.movie_id = movies.id
+GROUP BY movies.id
+ON CONFLICT (movie_id) DO UPDATE
+SET review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    rating_histogram = EXCLUDED.rating_histogram,
+    updated_at = NOW();
+
+-- server-side search results, referenced by their ID in the results page URL
+
+CREATE TABLE IF NOT EXISTS search_results (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    movie_ids UUID[] NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS search_results_created_at_idx ON search_results (created_at);
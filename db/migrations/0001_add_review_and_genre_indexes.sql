@@ -0,0 +1,5 @@
+-- lookups of a user's reviews (profile, "already rated" checks) and movies by genre (search)
+
+CREATE INDEX IF NOT EXISTS reviews_user_id_idx ON reviews (user_id);
+
+CREATE INDEX IF NOT EXISTS movies_genre_id_idx ON movies (genre_id);
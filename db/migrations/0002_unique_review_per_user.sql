@@ -0,0 +1,13 @@
+-- one review per user & movie, enforced by the database instead of a SELECT before INSERT
+-- keep the oldest review of any duplicates (the stats triggers fix movie_stats on delete)
+
+DELETE FROM reviews
+USING reviews AS kept
+WHERE reviews.movie_id = kept.movie_id
+    AND reviews.user_id = kept.user_id
+    AND (reviews.created_at, reviews.id) > (kept.created_at, kept.id);
+
+-- also serves the lookups of a movie's reviews (movie_id is the leading column),
+-- so a separate index on reviews.movie_id isn't needed
+
+CREATE UNIQUE INDEX IF NOT EXISTS reviews_movie_id_user_id_key ON reviews (movie_id, user_id);
@@ -0,0 +1,5 @@
+-- keyset pagination of a movie's reviews, newest first (scanned backwards) and by rating
+
+CREATE INDEX IF NOT EXISTS reviews_movie_id_created_at_idx ON reviews (movie_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS reviews_movie_id_rating_idx ON reviews (movie_id, rating, created_at, id);
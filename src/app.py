@@ -17,3 +17,11 @@ from routes import users
 from routes import index
 from routes import search
 from routes import profile
+from routes import admin
+from routes import api
+
+from commands import stats
+from commands import import_movies
+from commands import export
+from commands import migrate
+from commands import seed
@@ -0,0 +1,58 @@
+"""CLI command for bulk exports of movies & reviews."""
+
+# pylint: disable=import-error
+
+
+import gzip
+import click
+from app import app
+from sql.exports import EXPORTS, copy_export_csv, stream_export
+from utils.export import encode_rows
+
+
+@app.cli.command("export")
+@click.argument("name", type=click.Choice(list(EXPORTS)))
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]),
+              default="csv", show_default=True, help="Output format.")
+@click.option("--gzip", "use_gzip", is_flag=True, help="Compress the output with gzip.")
+@click.option("--output", "output_path", type=click.Path(dir_okay=False, allow_dash=True),
+              default="-", help="Output file. Defaults to stdout.")
+def command_export(
+        name: str,
+        file_format: str,
+        use_gzip: bool,
+        output_path: str) -> None:
+    """Export all movies or reviews (with genre names & usernames) as CSV or JSONL.
+
+    CSV is dumped with COPY, JSONL over a server-side cursor.
+    """
+    if output_path == "-":
+        output = click.get_binary_stream("stdout")
+    else:
+        # pylint: disable=consider-using-with
+        output = open(output_path, "wb")
+
+    try:
+        file = gzip.GzipFile(fileobj=output, mode="wb") if use_gzip else output
+
+        if file_format == "csv":
+            db_result = copy_export_csv(name, file)
+        else:
+            db_result = stream_export(name)
+
+            if db_result["success"]:
+                for chunk in encode_rows(db_result["data"], "jsonl", EXPORTS[name][0]):
+                    file.write(chunk)
+
+        if use_gzip:
+            file.close()
+
+    finally:
+        if output_path != "-":
+            output.close()
+
+    if not db_result["success"]:
+        raise click.ClickException(db_result["error"])
+
+    if output_path != "-":
+        click.echo(f"Exported {name} to {output_path}.")
@@ -0,0 +1,208 @@
+"""CLI command for importing movies in bulk from CSV or JSONL files."""
+
+# pylint: disable=import-error
+
+
+import csv
+import json
+from typing import Iterator, TextIO
+from uuid import UUID
+import click
+from app import app
+from sql.genres import get_genre_ids, get_genre_names_by_id
+from sql.imports import import_movies
+from sql.users import get_user_id_by_username
+from utils.validate_movie_details import check_movie_details
+
+
+def read_csv(file: TextIO) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Function to read movie records from a CSV file with a header row
+    (title, genre, description, year).
+
+    Args:
+        file (TextIO): Opened file.
+
+    Yields:
+        tuple[int, dict | None, str | None]: Line number, record and parse error (if any).
+    """
+    reader = csv.DictReader(file)
+
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def read_jsonl(file: TextIO) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Function to read movie records from a JSONL file (one JSON object per line).
+
+    Args:
+        file (TextIO): Opened file.
+
+    Yields:
+        tuple[int, dict | None, str | None]: Line number, record and parse error (if any).
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_number, None, "Line must be a JSON object."
+            continue
+
+        yield line_number, record, None
+
+
+def normalize_genre(genre: str, genre_ids_by_name: dict[str, str]) -> str:
+    """Function to turn a genre ID (any case) or name into the canonical genre ID.
+
+    Args:
+        genre (str): Genre ID or name.
+        genre_ids_by_name (dict[str, str]): Genre IDs keyed by lowercase name.
+
+    Returns:
+        str: Genre ID, or the input as is if it's neither.
+    """
+    if not isinstance(genre, str):
+        return genre
+
+    try:
+        return str(UUID(genre))
+    except ValueError:
+        return genre_ids_by_name.get(genre.strip().lower(), genre)
+
+
+@app.cli.command("import-movies")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user", "username", required=True,
+              help="Username of the user the movies are added as.")
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]),
+              default=None, help="File format. Guessed from the file extension by default.")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=5000,
+              show_default=True, help="Amount of movies inserted per transaction.")
+@click.option("--rejects", "rejects_path", type=click.Path(dir_okay=False), default=None,
+              help="File for the rejected rows (JSONL). Defaults to PATH.rejects.jsonl.")
+def command_import_movies(
+        path: str,
+        username: str,
+        file_format: str | None,
+        chunk_size: int,
+        rejects_path: str | None) -> None:
+    """Import movies (title, genre, description, year) from a CSV or JSONL file.
+
+    Genres can be given as IDs or names. Rows are validated with the same rules
+    as the Add Movie form; invalid rows and titles that already exist are written
+    to the reject file instead.
+    """
+    if file_format is None:
+        file_format = "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+    if rejects_path is None:
+        rejects_path = f"{path}.rejects.jsonl"
+
+    user_id = get_user_id_by_username(username)
+
+    if not user_id["success"]:
+        raise click.ClickException(f"User '{username}': {user_id['error']}")
+
+    genre_ids = get_genre_ids()
+    genre_names = get_genre_names_by_id()
+
+    if not genre_ids["success"] or not genre_names["success"]:
+        raise click.ClickException("Fetching genres failed.")
+
+    genre_ids_by_name = {
+        name.lower(): genre_id for genre_id, name in genre_names["data"].items()}
+
+    imported = 0
+    rejected = 0
+    seen_titles = set()
+    rejects_file = None
+
+    def reject(line_number: int, record: dict | None, error: str) -> None:
+        nonlocal rejected, rejects_file
+
+        if rejects_file is None:
+            # pylint: disable=consider-using-with
+            rejects_file = open(rejects_path, "w", encoding="utf-8")
+
+        rejects_file.write(json.dumps(
+            {"line": line_number, "error": error, "row": record}) + "\n")
+        rejected += 1
+
+    def flush(chunk: list[tuple[int, dict, dict]]) -> None:
+        nonlocal imported
+
+        db_result = import_movies([movie for _, _, movie in chunk], user_id["data"])
+
+        if not db_result["success"]:
+            raise click.ClickException(
+                f"Import failed after {imported} movies: {db_result['error']}")
+
+        for line_number, record, movie in chunk:
+            if movie["title"] not in db_result["data"]:
+                reject(line_number, record,
+                       f"Movie named '{movie['title']}' already exists.")
+
+        imported += len(db_result["data"])
+
+    reader = read_jsonl if file_format == "jsonl" else read_csv
+
+    try:
+        with open(path, newline="", encoding="utf-8") as file:
+            chunk = []
+
+            for line_number, record, error in reader(file):
+                if error is not None:
+                    reject(line_number, record, error)
+                    continue
+
+                year = record.get("year")
+
+                # JSON numbers are fine as well
+                if isinstance(year, int) and not isinstance(year, bool):
+                    year = str(year)
+
+                movie = {
+                    "title": record.get("title"),
+                    "genre": normalize_genre(record.get("genre"), genre_ids_by_name),
+                    "description": record.get("description"),
+                    "year": year
+                }
+
+                error = check_movie_details(
+                    movie["title"],
+                    movie["genre"],
+                    movie["description"],
+                    movie["year"],
+                    genre_ids["data"])
+
+                if error is None and movie["title"] in seen_titles:
+                    error = f"Movie named '{movie['title']}' appears more than once."
+
+                if error is not None:
+                    reject(line_number, record, error)
+                    continue
+
+                seen_titles.add(movie["title"])
+                chunk.append((line_number, record, movie))
+
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+
+            if chunk:
+                flush(chunk)
+
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+
+    click.echo(f"Imported {imported} movies.")
+
+    if rejected:
+        click.echo(f"Rejected {rejected} rows, see {rejects_path}.")
@@ -0,0 +1,108 @@
+"""CLI commands for the schema migrations."""
+
+# pylint: disable=import-error
+
+
+import re
+from pathlib import Path
+import click
+from flask.cli import with_appcontext
+from app import app
+from sql.migrations import apply_migration, get_applied_migrations
+
+
+# file names look like "0001_add_review_indexes.sql"
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+MIGRATIONS_DIR = Path(app.root_path).parent / "db" / "migrations"
+
+
+def find_migrations(directory: Path) -> list[tuple[int, str, Path]]:
+    """Function to list the migration files of a directory.
+
+    Args:
+        directory (Path): Directory with the migration files.
+
+    Returns:
+        list[tuple[int, str, Path]]: Version, name & path of each migration, ordered by version.
+    """
+    migrations = {}
+
+    for path in directory.glob("*.sql"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+
+        if match is None:
+            raise click.ClickException(
+                f"Migration file '{path.name}' must be named like '0001_name.sql'.")
+
+        version = int(match.group(1))
+
+        if version in migrations:
+            raise click.ClickException(
+                f"Migrations '{migrations[version][2].name}' and '{path.name}' "
+                "have the same version.")
+
+        migrations[version] = (version, match.group(2), path)
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+@app.cli.group("migrate", invoke_without_command=True)
+@click.option("--dir", "directory", type=click.Path(exists=True, file_okay=False, path_type=Path),
+              default=MIGRATIONS_DIR, help="Migrations directory. Defaults to db/migrations.")
+@click.pass_context
+@with_appcontext
+def command_migrate(context: click.Context, directory: Path) -> None:
+    """Apply all pending schema migrations (in version order)."""
+    context.obj = find_migrations(directory)
+
+    if context.invoked_subcommand is not None:
+        return
+
+    applied = get_applied_migrations()
+
+    if not applied["success"]:
+        raise click.ClickException(applied["error"])
+
+    pending = [
+        migration for migration in context.obj if migration[0] not in applied["data"]]
+
+    if not pending:
+        click.echo("Database is up to date.")
+        return
+
+    for version, name, path in pending:
+        db_result = apply_migration(version, name, path.read_text(encoding="utf-8"))
+
+        if not db_result["success"]:
+            raise click.ClickException(
+                f"Migration {version:04d} '{name}' failed: {db_result['error']}")
+
+        if db_result["data"]:
+            click.echo(f"Applied {version:04d} {name}.")
+        else:
+            click.echo(f"Skipped {version:04d} {name} (applied meanwhile).")
+
+
+@command_migrate.command("status")
+@click.pass_obj
+def command_migrate_status(migrations: list[tuple[int, str, Path]]) -> None:
+    """List the migrations and whether they have been applied."""
+    applied = get_applied_migrations()
+
+    if not applied["success"]:
+        raise click.ClickException(applied["error"])
+
+    for version, name, _ in migrations:
+        if version in applied["data"]:
+            click.echo(
+                f"[applied {applied['data'][version]['applied_at']}] {version:04d} {name}")
+        else:
+            click.echo(f"[pending] {version:04d} {name}")
+
+    files = {migration[0] for migration in migrations}
+
+    for version, migration in applied["data"].items():
+        if version not in files:
+            click.echo(
+                f"[applied, file missing] {version:04d} {migration['name']}")
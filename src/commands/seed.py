@@ -0,0 +1,136 @@
+"""CLI command for seeding the database with synthetic users, movies & reviews."""
+
+# pylint: disable=import-error
+
+
+import click
+from werkzeug.security import generate_password_hash
+from app import app
+from sql.genres import get_all_genres
+from sql.seed import (
+    SEED_USERNAME_PREFIX, delete_seed_data, get_seed_counts, get_seed_movies,
+    get_seed_user_ids, insert_seed_movies, insert_seed_reviews, insert_seed_users)
+from sql.stats import rebuild_movie_stats
+from utils.seed_data import SEED_NOW, ReviewGenerator, movie_rows, user_rows
+
+
+# password of every seeded user
+SEED_PASSWORD = "seed-password"
+
+# review batches in a row that may add nothing before giving up
+MAX_EMPTY_REVIEW_BATCHES = 5
+
+
+def check(db_result: dict) -> object:
+    """Function to stop the command if a database call failed.
+
+    Args:
+        db_result (dict): SQL Operation Result.
+
+    Returns:
+        object: Data of the result.
+    """
+    if not db_result["success"]:
+        raise click.ClickException(db_result["error"])
+
+    return db_result["data"]
+
+
+@app.cli.command("seed")
+@click.option("--users", type=click.IntRange(min=0), default=1000, show_default=True,
+              help="Amount of seeded users to have.")
+@click.option("--movies", type=click.IntRange(min=0), default=500, show_default=True,
+              help="Amount of seeded movies to have.")
+@click.option("--reviews", type=click.IntRange(min=0), default=20000, show_default=True,
+              help="Amount of seeded reviews to have.")
+@click.option("--seed", "seed", type=int, default=42, show_default=True,
+              help="Seed of the random data.")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=50000, show_default=True,
+              help="Rows loaded per transaction.")
+@click.option("--reset", is_flag=True, help="Delete all seeded data first.")
+def command_seed(
+        users: int,
+        movies: int,
+        reviews: int,
+        seed: int,
+        chunk_size: int,
+        reset: bool) -> None:
+    """Add synthetic users, movies & reviews until there are as many as asked for.
+
+    Seeded data is only ever added (unless --reset is given), so running the
+    command again with bigger amounts tops the database up. Review counts of the
+    movies follow a Zipf distribution, ratings lean towards the upper half and
+    comments vary in length. The same seed gives the same data.
+    """
+    if reset:
+        deleted = check(delete_seed_data())
+        click.echo(f"Deleted {deleted} seeded users with their movies & reviews.")
+
+    counts = check(get_seed_counts())
+    now = SEED_NOW
+
+    if counts["users"] < users:
+        password_hash = generate_password_hash(SEED_PASSWORD)
+
+        for start in range(counts["users"], users, chunk_size):
+            check(insert_seed_users(user_rows(
+                seed, start, min(chunk_size, users - start), password_hash,
+                SEED_USERNAME_PREFIX, now)))
+
+        click.echo(f"Added {users - counts['users']} users.")
+
+    user_ids = check(get_seed_user_ids())
+
+    if counts["movies"] < movies:
+        if not user_ids:
+            raise click.ClickException("Movies need seeded users, use --users.")
+
+        genre_ids = [genre["id"] for genre in check(get_all_genres())]
+
+        for start in range(counts["movies"], movies, chunk_size):
+            check(insert_seed_movies(movie_rows(
+                seed, start, min(chunk_size, movies - start), genre_ids, user_ids, now)))
+
+        click.echo(f"Added {movies - counts['movies']} movies.")
+
+    added_reviews = 0
+
+    if counts["reviews"] < reviews:
+        seeded_movies = check(get_seed_movies())
+
+        if not seeded_movies:
+            raise click.ClickException("Reviews need seeded movies, use --movies.")
+
+        generator = ReviewGenerator(seed, seeded_movies, user_ids)
+        seeded = counts["reviews"]
+        attempt = 0
+
+        while seeded < reviews:
+            inserted = check(insert_seed_reviews(generator.rows(
+                seeded, min(chunk_size, reviews - seeded), now, attempt)))
+
+            # every pair of the batch was taken already
+            if inserted == 0:
+                attempt += 1
+
+                # the users have rated (nearly) every movie they can
+                if attempt == MAX_EMPTY_REVIEW_BATCHES:
+                    click.echo("No more reviews could be added, use more users or movies.")
+                    break
+
+                continue
+
+            seeded += inserted
+            added_reviews += inserted
+            attempt = 0
+
+        click.echo(f"Added {added_reviews} reviews.")
+
+    # seeded reviews are loaded & deleted without the statistics trigger
+    if reset or added_reviews:
+        check(rebuild_movie_stats())
+
+    counts = check(get_seed_counts())
+    click.echo(
+        f"Seeded data: {counts['users']} users, {counts['movies']} movies, "
+        f"{counts['reviews']} reviews.")
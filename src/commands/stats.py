@@ -0,0 +1,19 @@
+"""CLI commands for the rating statistics."""
+
+# pylint: disable=import-error
+
+
+import click
+from app import app
+from sql.stats import rebuild_movie_stats
+
+
+@app.cli.command("rebuild-movie-stats")
+def command_rebuild_movie_stats() -> None:
+    """Recompute the movie_stats table (counts, averages, histograms) from all reviews."""
+    db_result = rebuild_movie_stats()
+
+    if not db_result["success"]:
+        raise click.ClickException(db_result["error"])
+
+    click.echo(f"Rebuilt rating statistics for {db_result['data']} movies.")
@@ -1,10 +1,74 @@
-"""Module for the DB setup."""
+"""Module for the DB setup.
+
+Connection pool & engine options are read from environment variables
+(see the installation manual for the full list)."""
 
 
 from os import getenv
 from flask_sqlalchemy import SQLAlchemy
 from app import app
+from utils.query_stats import install_query_stats
+
+
+def getenv_bool(key: str, default: bool) -> bool:
+    """Function to read a boolean environment variable.
+
+    Args:
+        key (str): Name of the variable.
+        default (bool): Value used when the variable is not set.
+
+    Returns:
+        bool: True for "1", "true", "yes" & "on" (case-insensitive), False otherwise.
+    """
+    value = getenv(key)
+
+    if value is None:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
 
 app.config["SQLALCHEMY_DATABASE_URI"] = getenv("SQLALCHEMY_DATABASE_URI")
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "pool_size": int(getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": getenv_bool("DB_POOL_PRE_PING", True),
+    "pool_use_lifo": getenv_bool("DB_POOL_USE_LIFO", False),
+    # compiled form cache of the SQL statements (per engine)
+    "query_cache_size": int(getenv("DB_QUERY_CACHE_SIZE", "500")),
+    "connect_args": {
+        "connect_timeout": int(getenv("DB_CONNECT_TIMEOUT", "10")),
+        # 0 disables the timeout
+        "options": f"-c statement_timeout={int(getenv('DB_STATEMENT_TIMEOUT', '0'))}"
+    }
+}
 db = SQLAlchemy(app)
+
+# per-request query counts & timings, slow query log
+with app.app_context():
+    install_query_stats(db.engine)
+
+
+def get_pool_status() -> dict:
+    """Function to get live statistics of the connection pool.
+
+    Returns:
+        dict: Pool settings & current connection counts.
+    """
+    pool = db.engine.pool
+    options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": options["max_overflow"],
+        "timeout": options["pool_timeout"],
+        "recycle": options["pool_recycle"],
+        "pre_ping": options["pool_pre_ping"],
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status()
+    }
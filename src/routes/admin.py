@@ -0,0 +1,99 @@
+"""Route handler for the admin API (monitoring & exports)."""
+
+# pylint: disable=import-error
+
+
+from typing import Callable
+from flask import Response, jsonify, request, session, stream_with_context
+from app import app
+from db import get_pool_status
+from sql.exports import EXPORTS, stream_export
+from sql.users import user_cache
+from utils.export import encode_rows, gzip_chunks
+from utils.loaders import get_loaders
+from utils.page_cache import page_cache
+
+
+def admin_error() -> Callable | None:
+    """Function to check that the current session belongs to an admin.
+
+    Returns:
+        Callable | None: JSON error response, or None if the user is an admin.
+    """
+    if "user_id" not in session:
+        return jsonify({"error": "No user logged in."}), 401
+
+    user = get_loaders().users.load(session["user_id"])
+
+    if not user["success"]:
+        print(user["error"])
+
+        return jsonify({"error": user["error"]}), 500
+
+    if not user["data"]["is_admin"]:
+        return jsonify({"error": "Only admins can view this."}), 403
+
+    return None
+
+
+@app.route("/api/admin/db/pool", methods=["GET"])
+def api_admin_db_pool() -> Callable:
+    """GET method for the live statistics of the DB connection pool & in-process caches.
+
+    Returns:
+        jsonify: Pool & cache statistics as JSON (admins only).
+    """
+    error = admin_error()
+
+    if error is not None:
+        return error
+
+    return jsonify({
+        "pool": get_pool_status(),
+        "caches": {
+            "users": user_cache.stats(),
+            "pages": page_cache.stats()
+        }
+    })
+
+
+@app.route("/api/admin/export/<name>", methods=["GET"])
+def api_admin_export(name: str) -> Callable:
+    """GET method for a bulk export of all movies or reviews (admins only).
+
+    Query parameters: `format` ("csv" (default) or "jsonl") and `gzip` ("1" compresses the file).
+
+    Args:
+        name (str): Export name ("movies" or "reviews").
+
+    Returns:
+        Response: Export file, streamed as it is read from the database.
+    """
+    error = admin_error()
+
+    if error is not None:
+        return error
+
+    file_format = request.args.get("format", "csv")
+
+    if name not in EXPORTS or file_format not in ("csv", "jsonl"):
+        return jsonify({"error": "Unknown export or format."}), 404
+
+    rows = stream_export(name)
+
+    if not rows["success"]:
+        return jsonify({"error": rows["error"]}), 500
+
+    chunks = encode_rows(rows["data"], file_format, EXPORTS[name][0])
+    filename = f"{name}.{file_format}"
+    mimetype = "text/csv" if file_format == "csv" else "application/x-ndjson"
+
+    if request.args.get("gzip") == "1":
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"})
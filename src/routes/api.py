@@ -0,0 +1,74 @@
+"""Route handler for the machine-readable read API (v1).
+
+Responses are newline-delimited JSON (one object per line), streamed to the
+client while the rows are read from the database."""
+
+# pylint: disable=import-error
+
+# pylint: disable=redefined-builtin
+# i want to use `id` as variable name but pylint ain't having it
+
+
+from json import dumps
+from typing import Callable, Iterator, Mapping
+from flask import Response, jsonify, stream_with_context
+from app import app
+from sql.exports import stream_movie_ratings_by_id, stream_movies
+
+
+# rows fetched from the server-side cursor at once
+STREAM_BATCH_SIZE = 1000
+
+
+def ndjson_response(rows: Iterator[Mapping]) -> Response:
+    """Function to build a streamed NDJSON response.
+
+    Args:
+        rows (Iterator[Mapping]): Objects (dicts or row structs) to send, one per line.
+
+    Returns:
+        Response: Streamed response.
+    """
+    def generate() -> Iterator[str]:
+        for row in rows:
+            yield dumps(dict(row)) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson")
+
+
+@app.route("/api/v1/movies", methods=["GET"])
+def api_v1_movies() -> Callable:
+    """GET method for all movies (with review counts & averages) as NDJSON.
+
+    Returns:
+        Response: Streamed NDJSON, movies ordered by ID.
+    """
+    movies = stream_movies(STREAM_BATCH_SIZE)
+
+    if not movies["success"]:
+        return jsonify({"error": movies["error"]}), 500
+
+    return ndjson_response(movies["data"])
+
+
+@app.route("/api/v1/movies/<id>/reviews", methods=["GET"])
+def api_v1_movie_reviews(id: str) -> Callable:
+    """GET method for all reviews of a movie as NDJSON.
+
+    Args:
+        id (str): Movie ID.
+
+    Returns:
+        Response: Streamed NDJSON, reviews ordered from oldest to newest.
+    """
+    ratings = stream_movie_ratings_by_id(id, STREAM_BATCH_SIZE)
+
+    if not ratings["success"]:
+        if ratings["error"] == "No movies found.":
+            return jsonify({"error": ratings["error"]}), 404
+
+        return jsonify({"error": ratings["error"]}), 500
+
+    return ndjson_response(ratings["data"])
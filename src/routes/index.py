@@ -6,36 +6,125 @@
 
 
 from typing import Callable
-from flask import render_template, session
+from flask import render_template, request, session
 from app import app
 from sql.movies import get_all_movies
+from sql.ratings import get_rated_movie_ids
+from sql.validators import get_movie_list_validator
+from utils.conditional import conditional_page, load_validator
+from utils.page_cache import (
+    get_cached_data, get_cached_page, listing_version, set_cached_data, set_cached_page)
+from utils.pagination import decode_cursor, encode_cursor
 
 
-@app.route("/", methods=["GET"])
-def page_index() -> Callable:
-    """GET method for the Index page.
+MOVIES_PER_PAGE = 50
+
+
+def get_movie_page(cursor: str | None) -> tuple[list[dict], str | None, str | None]:
+    """Function to fetch one page of the movie list.
+
+    The page data is shared between all visitors through the page cache;
+    the 'rated' flag of the current user is added on top of a copy of it.
+
+    Args:
+        cursor (str | None): Cursor of the previous page (from the query string), if any.
+
+    Returns:
+        tuple[list[dict], str | None, str | None]: Movies on the page,
+        cursor for the next page (None on the last page) and an error message, if any.
+    """
+    cache_key = ("index", cursor, listing_version())
+    cached = get_cached_data(cache_key)
+
+    if cached is None:
+        # one extra row tells whether there's a next page
+        movies = get_all_movies(
+            after=decode_cursor(cursor, 2),
+            limit=MOVIES_PER_PAGE + 1)
+
+        if not movies["success"]:
+            return [], None, movies["error"]
+
+        page = movies["data"][:MOVIES_PER_PAGE]
+        next_cursor = None
+
+        if len(movies["data"]) > MOVIES_PER_PAGE:
+            next_cursor = encode_cursor(page[-1]["title"], page[-1]["id"])
+
+        cached = (page, next_cursor)
+        set_cached_data(cache_key, cached)
+
+    page = [dict(movie) for movie in cached[0]]
+    rated_ids = frozenset()
+
+    if "user_id" in session:
+        rated = get_rated_movie_ids(session["user_id"])
+
+        if rated["success"]:
+            rated_ids = rated["data"]
+        else:
+            print(rated["error"])
+
+    for movie in page:
+        movie["rated"] = movie["id"] in rated_ids
+
+    return page, cached[1], None
+
+
+def render_movie_list(template: str, cursor: str | None) -> str:
+    """Function to render a page of the movie list, served from the page cache
+    for anonymous visitors.
+
+    Args:
+        template (str): Template to render ("movies.html" or the "movies.list.html" fragment).
+        cursor (str | None): Cursor of the previous page (from the query string), if any.
 
     Returns:
-        render_template: HTML page called "movies.html" with the appropriate movies data, if any.
+        str: Rendered HTML.
     """
-    movies = get_all_movies()
+    cache_key = (template, cursor, listing_version())
+    html = get_cached_page(cache_key)
+
+    if html is not None:
+        return html
+
+    movies, next_cursor, error = get_movie_page(cursor)
+
+    if error:
+        print(error)
+
+    html = render_template(template, movies=movies, next_cursor=next_cursor)
 
-    if not movies["success"]:
-        print(movies["error"])
+    if not error:
+        set_cached_page(cache_key, html)
 
-        return render_template("movies.html", movies=[])
+    return html
 
-    user_id = session["user_id"] if "user_id" in session else None
 
-    for movie in movies["data"]:
-        rated = False
+@app.route("/", methods=["GET"])
+def page_index() -> Callable:
+    """GET method for the Index page.
 
-        if user_id:
-            for review in movie["reviews"]:
-                if review["user_id"] == user_id:
-                    rated = True
-                    break
+    Returns:
+        render_template: HTML page called "movies.html" with the first page of movies
+        (or the page after the `after` cursor), if any.
+    """
+    cursor = request.args.get("after")
+    validator = load_validator(
+        ("index", cursor, listing_version()),
+        lambda: get_movie_list_validator(decode_cursor(cursor, 2), MOVIES_PER_PAGE + 1))
 
-        movie["rated"] = rated
+    return conditional_page(
+        validator,
+        lambda: render_movie_list("movies.html", cursor))
 
-    return render_template("movies.html", movies=movies["data"])
+
+@app.route("/movies/list", methods=["GET"])
+def page_movie_list_fragment() -> Callable:
+    """GET method for a partial page of the movie list (used for "load more" scrolling).
+
+    Returns:
+        render_template: HTML fragment called "movies.list.html" with the movies
+        after the `after` cursor.
+    """
+    return render_movie_list("movies.list.html", request.args.get("after"))
@@ -10,10 +10,21 @@
 from typing import Callable
 from flask import redirect, render_template, request, session, flash
 from app import app
-from utils.validate_movie_details import validate_movie_details
 from sql.genres import get_all_genres
-from sql.movies import add_movie, get_movie_by_id, rate_movie, delete_movie_by_id, get_rating_by_id, delete_rating_by_id, edit_movie_by_id
-from sql.users import get_user_by_id
+from sql.movies import add_movie, delete_movie_by_id, edit_movie_by_id
+from sql.movies import get_movie_detail_by_id, get_movie_header_by_id
+from sql.ratings import rate_movie, delete_rating_by_id, get_user_movie_rating
+from sql.ratings import REVIEW_SORTS, get_movie_ratings_page, get_rated_movie_ids, review_sort_key
+from sql.validators import get_movie_validator
+from utils.conditional import conditional_page, load_validator
+from utils.loaders import get_loaders
+from utils.page_cache import (
+    get_cached_data, get_cached_page, movie_version, set_cached_data, set_cached_page)
+from utils.pagination import decode_cursor, encode_cursor
+from utils.validate_movie_details import validate_movie_details
+
+
+REVIEWS_PER_PAGE = 20
 
 
 @app.route("/movies", methods=["GET"])
@@ -35,39 +46,195 @@ def page_movie(id: str) -> Callable:
 
     Returns:
         render_template: Returns the HTML page called "movie.html" with
-        the movie details (if only found).
+        the movie details (if only found) and the first page of reviews
+        (or the page after the `after` cursor) in the `sort` order.
     """
     if not id or not isinstance(id, str):
         return render_template(
             "error.html",
             error="Given movie ID was invalid.")
 
-    movie = get_movie_by_id(id)
+    version = movie_version(id)
+    validator = load_validator(
+        ("movie", id, version),
+        lambda: get_movie_validator(id))
+
+    return conditional_page(
+        validator,
+        lambda: render_movie_page(
+            id,
+            version,
+            get_review_sort(),
+            request.args.get("after")))
+
+
+@app.route("/movies/<id>/reviews", methods=["GET"])
+def page_movie_reviews_fragment(id: str) -> Callable:
+    """GET method for a partial page of a movie's reviews (used for "load more" scrolling).
+
+    Args:
+        id (str): Movie ID.
+
+    Returns:
+        render_template: HTML fragment called "movie.reviews.html" with the reviews
+        after the `after` cursor in the `sort` order, or an error page (404 if the
+        movie doesn't exist).
+    """
+    sort = get_review_sort()
+    cursor = request.args.get("after")
+    version = movie_version(id)
+    cache_key = ("movie.reviews.html", id, sort, cursor, version)
+    html = get_cached_page(cache_key)
+
+    if html is not None:
+        return html
+
+    # made-up IDs would fill the page cache
+    movie = get_loaders().movies.load_many([id])
 
     if not movie["success"]:
         print(movie["error"])
 
         return render_template("error.html", error=movie["error"])
 
-    created_by = get_user_by_id(movie["data"]["created_by"])
+    if movie["data"][0] is None:
+        return render_template("error.html", error="No movies found."), 404
+
+    reviews, next_cursor, error = get_review_page(id, sort, cursor, version)
+
+    if error:
+        print(error)
+
+    html = render_template(
+        "movie.reviews.html",
+        movie_id=id,
+        sort=sort,
+        reviews=reviews,
+        next_cursor=next_cursor)
+
+    if not error:
+        set_cached_page(cache_key, html)
 
-    if not created_by["success"]:
-        movie["data"]["created_by_user"] = "N/A"
-    else:
-        movie["data"]["created_by_user"] = created_by["data"]["username"]
+    return html
 
-    user_id = session["user_id"] if "user_id" in session else None
-    rated = False
 
-    if user_id:
-        for review in movie["data"]["reviews"]:
-            if review["user_id"] == user_id:
-                rated = True
-                break
+def get_review_sort() -> str:
+    """Function to read the review order from the query string.
 
-    movie["data"]["rated"] = rated
+    Returns:
+        str: "newest" (default), "highest" or "lowest".
+    """
+    sort = request.args.get("sort", "newest")
+
+    return sort if sort in REVIEW_SORTS else "newest"
+
+
+def get_review_page(
+        id: str,
+        sort: str,
+        cursor: str | None,
+        version: int) -> tuple[list[dict], str | None, str | None]:
+    """Function to fetch one page of a movie's reviews, shared by all visitors
+    through the page cache.
+
+    Args:
+        id (str): Movie ID.
+        sort (str): Review order.
+        cursor (str | None): Cursor of the previous page (from the query string), if any.
+        version (int): Current version of the movie in the page cache.
+
+    Returns:
+        tuple[list[dict], str | None, str | None]: Reviews on the page,
+        cursor for the next page (None on the last page) and an error message, if any.
+    """
+    cache_key = ("reviews", id, sort, cursor, version)
+    cached = get_cached_data(cache_key)
+
+    if cached is None:
+        # one extra row tells whether there's a next page
+        reviews = get_movie_ratings_page(
+            id,
+            sort,
+            decode_cursor(cursor, len(REVIEW_SORTS[sort][0])),
+            REVIEWS_PER_PAGE + 1)
+
+        if not reviews["success"]:
+            return [], None, reviews["error"]
+
+        page = reviews["data"][:REVIEWS_PER_PAGE]
+        next_cursor = None
+
+        if len(reviews["data"]) > REVIEWS_PER_PAGE:
+            next_cursor = encode_cursor(*review_sort_key(page[-1], sort))
 
-    return render_template("movie.html", movie=movie["data"])
+        cached = (page, next_cursor)
+        set_cached_data(cache_key, cached)
+
+    return cached[0], cached[1], None
+
+
+def render_movie_page(
+        id: str,
+        version: int,
+        sort: str,
+        cursor: str | None) -> str:
+    """Function to render the Movie page, served from the page cache
+    for anonymous visitors.
+
+    Args:
+        id (str): Movie ID.
+        version (int): Current version of the movie in the page cache.
+        sort (str): Review order.
+        cursor (str | None): Cursor of the previous page of reviews, if any.
+
+    Returns:
+        str: Rendered HTML (the error page if the movie wasn't found).
+    """
+    cache_key = ("movie", id, sort, cursor, version)
+    html = get_cached_page(cache_key)
+
+    if html is not None:
+        return html
+
+    movie_data = get_cached_data(("movie", id, version))
+
+    if movie_data is None:
+        # creator's username comes along in the same query
+        movie = get_movie_detail_by_id(id)
+
+        if not movie["success"]:
+            print(movie["error"])
+
+            return render_template("error.html", error=movie["error"])
+
+        movie_data = movie["data"]
+        set_cached_data(("movie", id, version), movie_data)
+
+    reviews, next_cursor, error = get_review_page(id, sort, cursor, version)
+
+    if error:
+        print(error)
+
+    # per-user bits go on a copy, the cached data is shared
+    movie_data = dict(movie_data)
+    movie_data["rated"] = False
+
+    if "user_id" in session:
+        rated = get_rated_movie_ids(session["user_id"])
+        movie_data["rated"] = rated["success"] and movie_data["id"] in rated["data"]
+
+    html = render_template(
+        "movie.html",
+        movie=movie_data,
+        movie_id=id,
+        sort=sort,
+        reviews=reviews,
+        next_cursor=next_cursor)
+
+    if not error:
+        set_cached_page(cache_key, html)
+
+    return html
 
 
 @app.route("/movies/add", methods=["GET"])
@@ -107,7 +274,7 @@ def page_rate_movie(id: str) -> Callable:
         flash("No user logged in.", 'error')
         return redirect("/auth/login")
 
-    user = get_user_by_id(session["user_id"])
+    user = get_loaders().users.load(session["user_id"])
 
     if not user["success"]:
         print(user["error"])
@@ -117,14 +284,25 @@ def page_rate_movie(id: str) -> Callable:
     # proper auth for csrf will be done in the API
     # HTML page is be returned if some session data is found
 
-    movie = get_movie_by_id(id)
+    movie = get_movie_header_by_id(id)
 
     if not movie["success"]:
         print(movie["error"])
 
         return render_template("error.html", error=movie["error"])
 
-    return render_template("movies.rate.html", movie=movie["data"])
+    # an existing rating is shown in the form, sending it updates the rating
+    own_rating = get_user_movie_rating(id, session["user_id"])
+
+    if not own_rating["success"]:
+        print(own_rating["error"])
+
+        return render_template("error.html", error=own_rating["error"])
+
+    return render_template(
+        "movies.rate.html",
+        movie=movie["data"],
+        own_rating=own_rating["data"])
 
 
 @app.route("/movies/edit/<id>", methods=["GET"])
@@ -142,7 +320,7 @@ def page_edit_movie(id: str) -> Callable:
         flash("No user logged in.", 'error')
         return redirect("/auth/login")
 
-    user = get_user_by_id(session["user_id"])
+    user = get_loaders().users.load(session["user_id"])
 
     if not user["success"]:
         print(user["error"])
@@ -156,7 +334,7 @@ def page_edit_movie(id: str) -> Callable:
     # proper auth for csrf will be done in the API
     # HTML page is be returned if some session data is found
 
-    movie = get_movie_by_id(id)
+    movie = get_movie_header_by_id(id)
 
     if not movie["success"]:
         print(movie["error"])
@@ -268,30 +446,22 @@ def api_delete_movie(id: str) -> Callable:
         return redirect("/auth/login")
 
     # get details and check for true user
-    # check both entities actually exist in the database
-    user = get_user_by_id(session["user_id"])
-    movie = get_movie_by_id(id)
+    user = get_loaders().users.load(session["user_id"])
 
     if not user["success"]:
         print(user["error"])
 
         return render_template("error.html", error=user["error"])
 
-    if not movie["success"]:
-        print(movie["error"])
-
-        return render_template("error.html", error=movie["error"])
-
-    # check for admin / owner
-    if not user["data"]["is_admin"]:
-        if session["user_id"] != movie["data"]["created_by"]:
-            flash("You are not allowed to delete this movie.", 'error')
-            return redirect(f"/movies/{id}")
-
     try:
-        db_result = delete_movie_by_id(id, user["data"]["is_admin"])
+        # ownership & reviews are checked by the delete itself
+        db_result = delete_movie_by_id(
+            id, session["user_id"], user["data"]["is_admin"])
 
         if not db_result["success"]:
+            if db_result["error"] == "No movies found.":
+                return render_template("error.html", error=db_result["error"])
+
             flash(db_result["error"], 'error')
 
             return redirect(f"/movies/{id}")
@@ -332,8 +502,9 @@ def api_edit_movie(id: str) -> Callable:
 
     # get details and check for 'true' user from db
     # verify the movie exists in db
-    user = get_user_by_id(session["user_id"])
-    movie = get_movie_by_id(id)
+    loaders = get_loaders()
+    user = loaders.users.load(session["user_id"])
+    movie = loaders.movies.load_many([id])
 
     if not user["success"]:
         print(user["error"])
@@ -345,6 +516,9 @@ def api_edit_movie(id: str) -> Callable:
 
         return render_template("error.html", error=movie["error"])
 
+    if movie["data"][0] is None:
+        return render_template("error.html", error="No movies found.")
+
     # check for admin
     if not user["data"]["is_admin"]:
         flash("You are not allowed to edit movie details.", 'error')
@@ -419,14 +593,17 @@ def api_rate_movie(id: str) -> Callable:
         flash("Unauthorized. Log in again.", 'error')
         return redirect("/auth/login")
 
-    # get movie details & check it exists
-    movie = get_movie_by_id(id)
+    # check the movie exists
+    movie = get_loaders().movies.load_many([id])
 
     if not movie["success"]:
         print(movie["error"])
 
         return render_template("error.html", error=movie["error"])
 
+    if movie["data"][0] is None:
+        return render_template("error.html", error="No movies found.")
+
     try:
         rating = request.form["rating"]
         comment = request.form["comment"]
@@ -434,6 +611,9 @@ def api_rate_movie(id: str) -> Callable:
         flash("Movie rating failed. Stars or comment was missing.", 'error')
         return redirect(f"/movies/rate/{id}")
 
+    # set by the form when the user already has a rating to update
+    upsert = request.form.get("upsert") == "1"
+
     try:
         # quick sanity checks for user input
         if not rating or not comment:
@@ -456,7 +636,8 @@ def api_rate_movie(id: str) -> Callable:
             flash("Comment must be between 4 and 1024 characters.", 'error')
             return redirect(f"/movies/rate/{id}")
 
-        db_result = rate_movie(id, rating_as_int, comment, session["user_id"])
+        db_result = rate_movie(
+            id, rating_as_int, comment, session["user_id"], upsert)
 
         if not db_result["success"]:
             if "has already" in db_result["error"]:
@@ -469,7 +650,11 @@ def api_rate_movie(id: str) -> Callable:
 
             return redirect(f"/movies/rate/{id}")
 
-        flash("Movie rating successful!", 'success')
+        if db_result["data"]["created"]:
+            flash("Movie rating successful!", 'success')
+        else:
+            flash("Movie rating updated!", 'success')
+
         return redirect(f"/movies/{id}")
 
     except Exception as e:
@@ -505,8 +690,9 @@ def api_delete_rating(id: str) -> Callable:
         return redirect("/auth/login")
 
     # get details & check all entities exist in db
-    user = get_user_by_id(session["user_id"])
-    rating = get_rating_by_id(id)
+    loaders = get_loaders()
+    user = loaders.users.load(session["user_id"])
+    rating = loaders.reviews.load(id)
 
     if not user["success"]:
         print(user["error"])
@@ -526,7 +712,7 @@ def api_delete_rating(id: str) -> Callable:
             return redirect("/movies")
 
     try:
-        db_result = delete_rating_by_id(id, user["data"]["is_admin"])
+        db_result = delete_rating_by_id(id, user["data"]["is_admin"], rating)
 
         if not db_result["success"]:
             flash(db_result["error"], 'error')
@@ -4,10 +4,12 @@
 # pylint: disable=broad-exception-caught
 
 
+from datetime import datetime
 from typing import Callable
 from flask import redirect, render_template, session, flash
 from app import app
-from sql.users import get_user_by_id
+from utils.conditional import conditional_page
+from utils.loaders import get_loaders
 
 
 @app.route("/profile", methods=["GET"])
@@ -23,11 +25,16 @@ def page_profile() -> Callable:
         flash("You must be logged in to view this page.", 'error')
         return redirect("/auth/login")
 
-    user_details = get_user_by_id(session["user_id"])
+    user_details = get_loaders().users.load(session["user_id"])
 
     if not user_details["success"]:
         print(user_details["error"])
 
         return render_template("error.html", error=user_details["error"])
 
-    return render_template("profile.html", user_details=user_details["data"])
+    updated_at = datetime.fromisoformat(user_details["data"]["updated_at"])
+
+    # the user row is all the page shows
+    return conditional_page(
+        {"validator": user_details["data"]["updated_at"], "last_modified": updated_at},
+        lambda: render_template("profile.html", user_details=user_details["data"]))
@@ -5,10 +5,19 @@
 
 
 from typing import Callable
-from flask import redirect, render_template, request, flash
+from flask import redirect, render_template, request, flash, url_for
 from app import app
 from sql.genres import get_all_genres
-from sql.movies import get_all_movies, get_movie_by_id
+from sql.search import (
+    get_search_results, save_search_results, search_movie_ids, search_movies_full_text)
+from sql.validators import get_movies_validator
+from utils.conditional import conditional_page, load_validator
+from utils.loaders import get_loaders
+from utils.page_cache import listing_version
+
+
+SEARCH_RESULT_LIMIT = 100
+FULL_TEXT_RESULTS_PER_PAGE = 20
 
 
 @app.route("/search", methods=["GET"])
@@ -53,20 +62,70 @@ def page_search_results(results: str) -> Callable:
     if not results or not isinstance(results, str):
         return render_template("error.html", error="Invalid URL!")
 
+    return conditional_search_results(results.split(","))
+
+
+@app.route("/search/handle/<handle>", methods=["GET"])
+def page_search_results_by_handle(handle: str) -> Callable:
+    """GET method for the Search Results page of server-side stored results.
+
+    Args:
+        handle (str): ID of the stored search results.
+
+    Returns:
+        render_template: HTML page called "search.results.html" with the search results.
+    """
+    search_results = get_search_results(handle)
+
+    if not search_results["success"]:
+        print(search_results["error"])
+        return render_template("error.html", error=search_results["error"])
+
+    return conditional_search_results(search_results["data"])
+
+
+def conditional_search_results(movie_ids: list[str]) -> Callable:
+    """Function to answer a Search Results page request with either 304 Not Modified
+    or the rendered results.
+
+    Args:
+        movie_ids (list[str]): Movie IDs in result order.
+
+    Returns:
+        Response: 304 response or the HTML page called "search.results.html".
+    """
+    validator = load_validator(
+        ("search", tuple(movie_ids), listing_version()),
+        lambda: get_movies_validator(movie_ids))
+
+    return conditional_page(
+        validator,
+        lambda: render_search_results(movie_ids))
+
+
+def render_search_results(movie_ids: list[str]) -> Callable:
+    """Function to render the Search Results page for the given movies.
+
+    Args:
+        movie_ids (list[str]): Movie IDs in result order.
+
+    Returns:
+        render_template: HTML page called "search.results.html" with the search results.
+    """
     try:
-        movie_ids = results.split(",")
-        movies = []
+        # one query for the whole page, unknown IDs come back as None
+        movies = get_loaders().movies.load_many(movie_ids)
 
-        for movie_id in movie_ids:
-            movie = get_movie_by_id(movie_id)
+        if not movies["success"]:
+            print(movies["error"])
+            return render_template("error.html", error=movies["error"])
 
-            if not movie["success"]:
-                print(movie["error"])
-                return render_template("error.html", error=movie["error"])
+        found = [movie for movie in movies["data"] if movie is not None]
 
-            movies.append(movie["data"])
+        if not found:
+            return render_template("search.no.results.html")
 
-        return render_template("search.results.html", movies=movies)
+        return render_template("search.results.html", movies=found)
 
     except Exception as e:
         print(e)
@@ -75,6 +134,63 @@ def page_search_results(results: str) -> Callable:
             error="An unexpected error occurred while fetching search results.")
 
 
+@app.route("/search/text", methods=["GET"])
+def page_search_full_text() -> Callable:
+    """GET method for the full-text search results page.
+
+    Query string holds the search terms (`q`), an optional genre ID (`genre`)
+    and the page number (`page`, starting from 1).
+
+    Returns:
+        redirect | render_template: HTML page called "search.results.html" with one page
+        of results ranked by relevance, or "search.no.results.html" if nothing matched.
+    """
+    query = request.args.get("q", "").strip()
+    genre = request.args.get("genre") or None
+
+    if not query:
+        flash("Search terms are required.", 'error')
+        return redirect("/search")
+
+    try:
+        page = max(int(request.args.get("page", "1")), 1)
+    except ValueError:
+        page = 1
+
+    # one extra row tells whether there's a next page
+    db_result = search_movies_full_text(
+        query,
+        genre,
+        FULL_TEXT_RESULTS_PER_PAGE + 1,
+        (page - 1) * FULL_TEXT_RESULTS_PER_PAGE)
+
+    if not db_result["success"]:
+        print(db_result["error"])
+        return render_template("error.html", error=db_result["error"])
+
+    movies = db_result["data"][:FULL_TEXT_RESULTS_PER_PAGE]
+
+    if not movies and page == 1:
+        return render_template("search.no.results.html")
+
+    previous_url = None
+    next_url = None
+
+    if page > 1:
+        previous_url = url_for(
+            "page_search_full_text", q=query, genre=genre, page=page - 1)
+
+    if len(db_result["data"]) > FULL_TEXT_RESULTS_PER_PAGE:
+        next_url = url_for(
+            "page_search_full_text", q=query, genre=genre, page=page + 1)
+
+    return render_template(
+        "search.results.html",
+        movies=movies,
+        previous_url=previous_url,
+        next_url=next_url)
+
+
 @app.route("/api/search", methods=["POST"])
 def api_search_results() -> Callable:
     """POST API endpoint for searching movies.
@@ -93,43 +209,43 @@ def api_search_results() -> Callable:
     except KeyError:
         genre = None
 
+    mode = request.form.get("mode", "title")
+
     try:
         if not title and not genre:
             flash("Title or genre is required.", 'error')
             return redirect("/search")
 
-        all_movies = get_all_movies()
-
-        if not all_movies["success"]:
-            print(all_movies["error"])
-            return render_template("error.html", error=all_movies["error"])
-
-        filtered_by_title = []
-
-        if title and isinstance(title, str):
-            for movie in all_movies["data"]:
-                if title.lower() in movie["title"].lower():
-                    filtered_by_title.append(movie)
+        if mode == "text":
+            if not title or not isinstance(title, str):
+                flash("Search terms are required for full-text search.", 'error')
+                return redirect("/search")
 
-        else:
-            filtered_by_title = all_movies["data"]
+            return redirect(url_for(
+                "page_search_full_text",
+                q=title,
+                genre=genre if isinstance(genre, str) and genre else None))
 
-        filtered_by_genre = []
+        db_result = search_movie_ids(
+            title if isinstance(title, str) else None,
+            genre if isinstance(genre, str) else None,
+            SEARCH_RESULT_LIMIT)
 
-        if genre and isinstance(genre, str):
-            for movie in filtered_by_title:
-                if genre.lower() in movie["genre_id"].lower():
-                    filtered_by_genre.append(movie)
+        if not db_result["success"]:
+            print(db_result["error"])
+            return render_template("error.html", error=db_result["error"])
 
-        else:
-            filtered_by_genre = filtered_by_title
+        if not db_result["data"]:
+            return redirect("/search/results/")
 
-        movie_ids = []
+        # results are kept server-side so that the URL stays short
+        handle = save_search_results(db_result["data"])
 
-        for movie in filtered_by_genre:
-            movie_ids.append(movie["id"])
+        if not handle["success"]:
+            print(handle["error"])
+            return render_template("error.html", error=handle["error"])
 
-        return redirect(f"/search/results/{','.join(movie_ids)}")
+        return redirect(f"/search/handle/{handle['data']}")
 
     except Exception as e:
         print(e)
@@ -0,0 +1,312 @@
+"""SQL module for bulk exports of the movies & reviews tables.
+
+Exports (and the streamed reads of the NDJSON API) are read on connections of
+their own (not the request's session), either over a server-side cursor or
+with `COPY ... TO STDOUT`, so memory use stays bounded however many rows
+there are."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+# pylint: disable=redefined-builtin
+# i want to use `id` as variable name but pylint ain't having it
+
+
+from typing import BinaryIO, Iterator
+from uuid import UUID
+from sqlalchemy import Connection, CursorResult, text
+from db import db
+from structs import MovieRow, ReviewRow, SQLOperationResult, SQLRow
+
+
+# export name -> (columns, query), columns in the same order as selected
+EXPORTS = {
+    "movies": (
+        ["id", "title", "description", "year", "genre_id", "genre", "created_by",
+         "created_by_username", "created_at", "updated_at", "review_count", "review_average"],
+        """
+        SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+            genres.name, movies.created_by, users.username, movies.created_at, movies.updated_at,
+            COALESCE(movie_stats.review_count, 0), movie_stats.rating_average
+        FROM movies
+        JOIN genres ON movies.genre_id = genres.id
+        LEFT JOIN users ON movies.created_by = users.id
+        LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+        ORDER BY movies.id ASC
+        """
+    ),
+    "reviews": (
+        ["id", "movie_id", "movie_title", "user_id", "username", "rating", "comment",
+         "created_at", "updated_at"],
+        """
+        SELECT reviews.id, reviews.movie_id, movies.title, reviews.user_id, users.username,
+            reviews.rating, reviews.comment, reviews.created_at, reviews.updated_at
+        FROM reviews
+        JOIN movies ON reviews.movie_id = movies.id
+        JOIN users ON reviews.user_id = users.id
+        ORDER BY reviews.id ASC
+        """
+    )
+}
+
+STREAM_MOVIES_SQL = text("""
+    SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+        movies.created_by, movies.created_at, movies.updated_at,
+        genres.name AS genre_name,
+        COALESCE(movie_stats.review_count, 0) AS review_count,
+        movie_stats.rating_average AS review_average
+    FROM movies
+    JOIN genres ON movies.genre_id = genres.id
+    LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+    ORDER BY movies.id ASC
+""")
+
+MOVIE_EXISTS_SQL = text(
+    "SELECT 1 FROM movies WHERE id = :id")
+
+STREAM_MOVIE_RATINGS_SQL = text("""
+    SELECT reviews.id, reviews.user_id, reviews.movie_id, reviews.rating, reviews.comment,
+        reviews.created_at, reviews.updated_at, users.username AS username
+    FROM reviews
+    JOIN users ON reviews.user_id = users.id
+    WHERE reviews.movie_id = :movie_id
+    ORDER BY reviews.created_at ASC, reviews.id ASC
+""")
+
+
+def export_value(value: object) -> object:
+    """Function to convert a fetched value into a JSON/CSV friendly one.
+
+    Args:
+        value (object): Value as returned by the driver.
+
+    Returns:
+        object: Timestamps in ISO format, UUIDs as strings, everything else as is.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+
+    return str(value)
+
+
+def stream_rows(
+        connection: Connection,
+        result: CursorResult,
+        row_class: type[SQLRow]) -> Iterator[SQLRow]:
+    """Function to iterate over a streamed result, closing its connection when done.
+
+    Args:
+        connection (Connection): Connection the result was fetched with.
+        result (CursorResult): Result over a server-side cursor.
+        row_class (type[SQLRow]): Row struct matching the columns of the query.
+
+    Yields:
+        SQLRow: One row at a time.
+    """
+    try:
+        for row in result:
+            yield row_class(row)
+    finally:
+        result.close()
+        connection.close()
+
+
+def stream_movies(batch_size: int = 1000) -> SQLOperationResult:
+    """Function to stream all movies from the database.
+
+    Rows are read over a server-side cursor `batch_size` at a time, so memory use
+    doesn't grow with the catalogue. The rows use a connection of their own, which
+    is held until the generator is exhausted or closed.
+
+    Args:
+        batch_size (int): Amount of rows fetched from the cursor at once.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a generator of movies ordered by ID.
+    """
+    connection = None
+
+    try:
+        connection = db.engine.connect().execution_options(
+            stream_results=True, yield_per=batch_size)
+        result = connection.execute(STREAM_MOVIES_SQL)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": stream_rows(connection, result, MovieRow)
+        }
+
+    except Exception as e:
+        print("DB Function 'stream_movies()' failed.")
+        print(e)
+
+        if connection is not None:
+            connection.close()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def stream_movie_ratings_by_id(id: str, batch_size: int = 1000) -> SQLOperationResult:
+    """Function to stream all ratings of a movie (oldest first).
+
+    See `stream_movies` for how the rows are read.
+
+    Args:
+        id (str): Movie ID as a string.
+        batch_size (int): Amount of rows fetched from the cursor at once.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a generator of ratings.
+    """
+    connection = None
+
+    not_found = {
+        "success": False,
+        "error": "No movies found.",
+        "data": None
+    }
+
+    try:
+        try:
+            UUID(id)
+        except ValueError:
+            return not_found
+
+        connection = db.engine.connect().execution_options(
+            stream_results=True, yield_per=batch_size)
+
+        if connection.execute(MOVIE_EXISTS_SQL, {"id": id}).fetchone() is None:
+            connection.close()
+            return not_found
+
+        result = connection.execute(STREAM_MOVIE_RATINGS_SQL, {"movie_id": id})
+
+        return {
+            "success": True,
+            "error": None,
+            "data": stream_rows(connection, result, ReviewRow)
+        }
+
+    except Exception as e:
+        print("DB Function 'stream_movie_ratings_by_id()' failed.")
+        print(e)
+
+        if connection is not None:
+            connection.close()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def stream_export(name: str, batch_size: int = 1000) -> SQLOperationResult:
+    """Function to stream the rows of an export over a server-side cursor.
+
+    Args:
+        name (str): Export name ("movies" or "reviews").
+        batch_size (int): Amount of rows fetched from the cursor at once.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a generator of rows
+        (dicts keyed by the export columns).
+    """
+    if name not in EXPORTS:
+        return {
+            "success": False,
+            "error": f"Unknown export '{name}'.",
+            "data": None
+        }
+
+    columns, query = EXPORTS[name]
+    connection = None
+
+    try:
+        connection = db.engine.connect().execution_options(
+            stream_results=True, yield_per=batch_size)
+        result = connection.execute(text(query))
+
+        return {
+            "success": True,
+            "error": None,
+            "data": stream_rows(connection, result, lambda row: {
+                column: export_value(value) for column, value in zip(columns, row)})
+        }
+
+    except Exception as e:
+        print("DB Function 'stream_export()' failed.")
+        print(e)
+
+        if connection is not None:
+            connection.close()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def copy_export_csv(name: str, file: BinaryIO) -> SQLOperationResult:
+    """Function to write an export as CSV (with a header row) with `COPY ... TO STDOUT`.
+
+    The fastest way to dump a table; the database formats the values itself.
+
+    Args:
+        name (str): Export name ("movies" or "reviews").
+        file (BinaryIO): File to write to (e.g. a gzip file).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of rows written.
+    """
+    if name not in EXPORTS:
+        return {
+            "success": False,
+            "error": f"Unknown export '{name}'.",
+            "data": None
+        }
+
+    columns, query = EXPORTS[name]
+    connection = None
+
+    try:
+        # COPY isn't available through SQLAlchemy, use the driver (psycopg2) connection
+        connection = db.engine.raw_connection()
+        cursor = connection.cursor()
+
+        # header row with the export's column names instead of the SELECT's
+        file.write((",".join(columns) + "\n").encode("utf-8"))
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", file)
+        rows = cursor.rowcount
+
+        cursor.close()
+        connection.commit()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": rows
+        }
+
+    except Exception as e:
+        print("DB Function 'copy_export_csv()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+    finally:
+        if connection is not None:
+            connection.close()
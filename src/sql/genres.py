@@ -1,16 +1,131 @@
-"""SQL module for genre-related stuff."""
+"""SQL module for genre-related stuff.
+
+Genres practically never change, so they are cached in-process.
+The cache expires after `GENRE_CACHE_TTL` seconds (env, default 300)
+and can be dropped explicitly with `invalidate_genre_cache()`."""
 
 # pylint: disable=import-error
 # pylint: disable=broad-exception-caught
 
 
+from os import getenv
+from threading import Lock
+from time import monotonic
 from sqlalchemy import text
 from db import db
-from structs import SQLOperationResult
+from structs import GenreRow, SQLOperationResult, map_rows
+
+
+GENRE_CACHE_TTL = float(getenv("GENRE_CACHE_TTL", "300"))
+
+_genre_cache_lock = Lock()
+_genre_cache = {
+    "genres": None,
+    "names_by_id": None,
+    "ids": None,
+    "expires_at": 0.0
+}
+
+
+def invalidate_genre_cache() -> None:
+    """Function to drop the cached genres. Call after any write to the genres table.
+    """
+    with _genre_cache_lock:
+        _genre_cache["genres"] = None
+        _genre_cache["names_by_id"] = None
+        _genre_cache["ids"] = None
+        _genre_cache["expires_at"] = 0.0
+
+
+def load_genre_cache() -> SQLOperationResult:
+    """Function to make sure the genre cache is populated (queries the database if
+    the cache is empty or expired).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the cache contents.
+    """
+    with _genre_cache_lock:
+        if _genre_cache["genres"] is not None and monotonic() < _genre_cache["expires_at"]:
+            return {
+                "success": True,
+                "error": None,
+                "data": _genre_cache
+            }
+
+        genres = fetch_all_genres()
+
+        if not genres["success"]:
+            return genres
+
+        _genre_cache["genres"] = genres["data"]
+        _genre_cache["names_by_id"] = {
+            genre["id"]: genre["name"] for genre in genres["data"]}
+        _genre_cache["ids"] = frozenset(_genre_cache["names_by_id"])
+        _genre_cache["expires_at"] = monotonic() + GENRE_CACHE_TTL
+
+        return {
+            "success": True,
+            "error": None,
+            "data": _genre_cache
+        }
 
 
 def get_all_genres() -> SQLOperationResult:
-    """Function to retrieve all genres from the database.
+    """Function to retrieve all genres (served from the genre cache).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result.
+    """
+    cache = load_genre_cache()
+
+    if not cache["success"]:
+        return cache
+
+    return {
+        "success": True,
+        "error": None,
+        "data": list(cache["data"]["genres"])
+    }
+
+
+def get_genre_ids() -> SQLOperationResult:
+    """Function to retrieve the set of valid genre IDs (served from the genre cache).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a frozenset of genre IDs.
+    """
+    cache = load_genre_cache()
+
+    if not cache["success"]:
+        return cache
+
+    return {
+        "success": True,
+        "error": None,
+        "data": cache["data"]["ids"]
+    }
+
+
+def get_genre_names_by_id() -> SQLOperationResult:
+    """Function to retrieve the genre ID -> genre name mapping (served from the genre cache).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict of genre names keyed by ID.
+    """
+    cache = load_genre_cache()
+
+    if not cache["success"]:
+        return cache
+
+    return {
+        "success": True,
+        "error": None,
+        "data": dict(cache["data"]["names_by_id"])
+    }
+
+
+def fetch_all_genres() -> SQLOperationResult:
+    """Function to retrieve all genres from the database (bypasses the genre cache).
 
     Returns:
         SQLOperationResult: SQL Operation Result.
@@ -22,20 +137,10 @@ def get_all_genres() -> SQLOperationResult:
         genres = result.fetchall()
 
         if genres is not None:
-            genres_as_dicts = []
-
-            for genre in genres:
-                genre_dict = {
-                    "id": str(genre[0]),
-                    "name": genre[1]
-                }
-
-                genres_as_dicts.append(genre_dict)
-
             return {
                 "success": True,
                 "error": None,
-                "data": genres_as_dicts
+                "data": map_rows(GenreRow, genres)
             }
 
         return {
@@ -45,7 +150,7 @@ def get_all_genres() -> SQLOperationResult:
         }
 
     except Exception as e:
-        print("DB Function 'get_all_genres()' failed.")
+        print("DB Function 'fetch_all_genres()' failed.")
         print(e)
 
         return {
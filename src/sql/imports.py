@@ -0,0 +1,90 @@
+"""SQL module for bulk imports of movies (see `flask import-movies`)."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+
+from csv import writer
+from io import StringIO
+from sqlalchemy import text
+from db import db
+from structs import SQLOperationResult
+from utils.page_cache import bump_versions
+
+
+CREATE_MOVIE_IMPORT_SQL = text("""
+    CREATE TEMPORARY TABLE movie_import (
+        title VARCHAR(255) NOT NULL,
+        genre_id UUID NOT NULL,
+        description VARCHAR(1024) NOT NULL,
+        year INT NOT NULL
+    ) ON COMMIT DROP
+""")
+
+INSERT_IMPORTED_MOVIES_SQL = text("""
+    INSERT INTO movies (title, genre_id, description, year, created_by)
+    SELECT title, genre_id, description, year, :created_by
+    FROM movie_import
+    ON CONFLICT (title) DO NOTHING
+    RETURNING title
+""")
+
+
+def import_movies(movies: list[dict], user_id: str) -> SQLOperationResult:
+    """Function to insert a batch of (already validated) movies in one transaction.
+
+    Rows are loaded into a temporary staging table with `COPY`, and then inserted
+    with a single statement. Movies whose title is already taken are skipped.
+
+    Args:
+        movies (list[dict]): Movies with "title", "genre" (ID), "description" & "year".
+        user_id (str): ID of the user the movies are added as.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a set of the titles that were inserted.
+    """
+    try:
+        buffer = StringIO()
+        csv_writer = writer(buffer)
+
+        for movie in movies:
+            csv_writer.writerow([
+                movie["title"],
+                movie["genre"],
+                movie["description"],
+                int(movie["year"])])
+
+        buffer.seek(0)
+
+        db.session.execute(CREATE_MOVIE_IMPORT_SQL)
+
+        # COPY isn't available through SQLAlchemy, use the driver (psycopg2) cursor
+        cursor = db.session.connection().connection.cursor()
+        cursor.copy_expert(
+            "COPY movie_import (title, genre_id, description, year) FROM STDIN WITH (FORMAT csv)",
+            buffer)
+        cursor.close()
+
+        result = db.session.execute(
+            INSERT_IMPORTED_MOVIES_SQL, {"created_by": user_id})
+        inserted = {row[0] for row in result.fetchall()}
+        db.session.commit()
+        bump_versions()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": inserted
+        }
+
+    except Exception as e:
+        print("DB Function 'import_movies()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
@@ -0,0 +1,129 @@
+"""SQL module for the schema migrations (`db/migrations`).
+
+Applied migrations are recorded in the `schema_migrations` table. Each
+migration runs in a transaction of its own, under an advisory lock so that
+two runners can't apply the same migration at once."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+
+from sqlalchemy import text
+from db import db
+from structs import SQLOperationResult
+
+
+# arbitrary key of the advisory lock held while a migration runs
+MIGRATION_LOCK_KEY = 727_001
+
+CREATE_SCHEMA_MIGRATIONS_SQL = text("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+""")
+
+GET_APPLIED_MIGRATIONS_SQL = text(
+    "SELECT version, name, applied_at FROM schema_migrations ORDER BY version ASC")
+
+LOCK_MIGRATIONS_SQL = text(
+    "SELECT pg_advisory_xact_lock(:key)")
+
+MIGRATION_APPLIED_SQL = text(
+    "SELECT 1 FROM schema_migrations WHERE version = :version")
+
+INSERT_MIGRATION_SQL = text(
+    "INSERT INTO schema_migrations (version, name) VALUES (:version, :name)")
+
+
+def get_applied_migrations() -> SQLOperationResult:
+    """Function to list the applied migrations (creates the bookkeeping table if needed).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict keyed by version,
+        each with the "name" & "applied_at" of the migration.
+    """
+    try:
+        db.session.execute(CREATE_SCHEMA_MIGRATIONS_SQL)
+        result = db.session.execute(GET_APPLIED_MIGRATIONS_SQL)
+        migrations = result.fetchall()
+        db.session.commit()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": {
+                migration[0]: {
+                    "name": migration[1],
+                    "applied_at": migration[2].isoformat()
+                } for migration in migrations
+            }
+        }
+
+    except Exception as e:
+        print("DB Function 'get_applied_migrations()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def apply_migration(version: int, name: str, sql: str) -> SQLOperationResult:
+    """Function to apply a single migration and record it, in one transaction.
+
+    Args:
+        version (int): Migration version (number prefix of the file name).
+        name (str): Migration name (rest of the file name).
+        sql (str): Contents of the migration file (any amount of statements).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is False if another
+        runner had already applied the migration, True otherwise.
+    """
+    try:
+        db.session.execute(LOCK_MIGRATIONS_SQL, {"key": MIGRATION_LOCK_KEY})
+
+        result = db.session.execute(MIGRATION_APPLIED_SQL, {"version": version})
+
+        if result.fetchone() is not None:
+            db.session.rollback()
+
+            return {
+                "success": True,
+                "error": None,
+                "data": False
+            }
+
+        # migration files are plain SQL (casts, quotes...), run them through the
+        # driver cursor so that nothing is taken for a bind parameter
+        cursor = db.session.connection().connection.cursor()
+        cursor.execute(sql)
+        cursor.close()
+
+        db.session.execute(
+            INSERT_MIGRATION_SQL, {"version": version, "name": name})
+        db.session.commit()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": True
+        }
+
+    except Exception as e:
+        print("DB Function 'apply_migration()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
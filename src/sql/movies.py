@@ -1,4 +1,4 @@
-"""SQL module for movie-related and review-related stuff."""
+"""SQL module for movie-related stuff (reviews are in `sql.ratings`)."""
 
 # pylint: disable=import-error
 # pylint: disable=broad-exception-caught
@@ -7,66 +7,147 @@
 # i want to use `id` as variable name but pylint ain't having it
 
 
-from flask import session
+from uuid import UUID
 from sqlalchemy import text
 from db import db
-from structs import SQLOperationResult
+from sql.ratings import get_movie_ratings_by_id, get_ratings_by_movie_ids
+from structs import MovieDetailRow, MovieRow, MovieStatsRow, SQLOperationResult, map_rows
+from utils.page_cache import bump_versions
+
+
+# statements of the hot paths are built once at import time, SQLAlchemy then
+# finds their compiled form in the engine's query cache on every execution
+
+MOVIE_LIST_SQL = """
+    SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+        movies.created_by, movies.created_at, movies.updated_at,
+        genres.name AS genre_name,
+        COALESCE(movie_stats.review_count, 0) AS review_count,
+        movie_stats.rating_average AS review_average
+    FROM movies
+    JOIN genres ON movies.genre_id = genres.id
+    LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+    {where}
+    ORDER BY movies.title ASC, movies.id ASC
+    LIMIT :limit
+"""
+
+GET_ALL_MOVIES_SQL = text(MOVIE_LIST_SQL.format(where=""))
+
+GET_MOVIES_AFTER_SQL = text(MOVIE_LIST_SQL.format(
+    where="WHERE (movies.title, movies.id) > (:after_title, CAST(:after_id AS UUID))"))
+
+GET_MOVIE_BY_ID_SQL = text("""
+    SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+        movies.created_by, movies.created_at, movies.updated_at,
+        genres.name AS genre_name,
+        COALESCE(movie_stats.review_count, 0) AS review_count,
+        movie_stats.rating_average AS review_average,
+        COALESCE(movie_stats.rating_histogram, array_fill(0, ARRAY[10])) AS rating_histogram
+    FROM movies
+    JOIN genres ON movies.genre_id = genres.id
+    LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+    WHERE movies.id = :id
+""")
+
+GET_MOVIE_DETAIL_BY_ID_SQL = text("""
+    SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+        movies.created_by, movies.created_at, movies.updated_at,
+        genres.name AS genre_name,
+        COALESCE(movie_stats.review_count, 0) AS review_count,
+        movie_stats.rating_average AS review_average,
+        COALESCE(movie_stats.rating_histogram, array_fill(0, ARRAY[10])) AS rating_histogram,
+        users.username AS created_by_username
+    FROM movies
+    JOIN genres ON movies.genre_id = genres.id
+    LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+    LEFT JOIN users ON movies.created_by = users.id
+    WHERE movies.id = :id
+""")
+
+GET_MOVIES_BY_IDS_SQL = text("""
+    SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+        movies.created_by, movies.created_at, movies.updated_at,
+        genres.name AS genre_name,
+        COALESCE(movie_stats.review_count, 0) AS review_count,
+        movie_stats.rating_average AS review_average,
+        COALESCE(movie_stats.rating_histogram, array_fill(0, ARRAY[10])) AS rating_histogram
+    FROM movies
+    JOIN genres ON movies.genre_id = genres.id
+    LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+    WHERE movies.id = ANY(CAST(:movie_ids AS UUID[]))
+""")
+
+LOCK_MOVIE_SQL = text(
+    "SELECT created_by FROM movies WHERE id = :id FOR UPDATE")
+
+# non-admins can only delete movies nobody else has reviewed
+DELETE_MOVIE_SQL = text("""
+    DELETE FROM movies
+    WHERE id = :id
+        AND (:as_admin OR NOT EXISTS (
+            SELECT 1 FROM reviews WHERE reviews.movie_id = movies.id AND reviews.user_id <> :user_id))
+    RETURNING id
+""")
+
+INSERT_MOVIE_SQL = text("""
+    INSERT INTO movies (title, genre_id, description, year, created_by)
+    VALUES (:title, :genre_id, :description, :year, :created_by)
+""")
+
+UPDATE_MOVIE_SQL = text("""
+    UPDATE movies
+    SET title = :title, genre_id = :genre_id, description = :description, year = :year
+    WHERE id = :id
+""")
+
+
+def get_all_movies(
+        include_reviews: bool = False,
+        after: tuple[str, str] | None = None,
+        limit: int | None = None) -> SQLOperationResult:
+    """Function to retrieve all movies from the database.
 
+    Movies are ordered by title (ID as a tie-breaker), which allows keyset
+    pagination with `after` & `limit`. Review count and average are read from
+    the `movie_stats` table. Full review lists are only fetched (with one extra query)
+    when asked for.
 
-def get_all_movies() -> SQLOperationResult:
-    """Function to retrieve all movies from the database.
+    Args:
+        include_reviews (bool): Whether to attach the full review list of each movie.
+        after (tuple[str, str] | None): (title, ID) of the last movie on the previous page.
+        limit (int | None): Maximum amount of movies to return. None returns all.
 
     Returns:
         SQLOperationResult: SQL Operation Result.
     """
     try:
-        sql = text("""
-            SELECT movies.*, genres.name AS genre_name
-            FROM movies
-            JOIN genres ON movies.genre_id = genres.id
-            ORDER BY movies.title ASC
-        """)
-        result = db.session.execute(sql)
+        sql = GET_ALL_MOVIES_SQL if after is None else GET_MOVIES_AFTER_SQL
+        params = {"limit": limit}
+
+        if after is not None:
+            params["after_title"], params["after_id"] = after
+
+        result = db.session.execute(sql, params)
         movies = result.fetchall()
 
         if movies is not None:
-            movies_as_dicts = []
-
-            for movie in movies:
-                movie_dict = {
-                    "id": str(movie[0]),
-                    "title": movie[1],
-                    "description": movie[2],
-                    "year": movie[3],
-                    "genre_id": str(movie[4]),
-                    "created_by": str(movie[5]),
-                    "created_at": movie[6].isoformat(),
-                    "updated_at": movie[7].isoformat(),
-                    "genre": movie[8]
-                }
-
-                ratings = get_movie_ratings_by_id(movie_dict["id"])
-
-                if ratings["success"]:
-                    movie_dict["reviews"] = ratings["data"]
-                    movie_dict["review_count"] = len(ratings["data"])
-
-                    if movie_dict["review_count"] > 0:
-                        movie_dict["review_average"] = sum(
-                            [review["rating"] for review in ratings["data"]]) / len(ratings["data"])
-                    else:
-                        movie_dict["review_average"] = None
-                else:
-                    movie_dict["reviews"] = []
-                    movie_dict["review_count"] = 0
-                    movie_dict["review_average"] = None
-
-                movies_as_dicts.append(movie_dict)
+            movie_rows = map_rows(MovieRow, movies)
+
+            if include_reviews:
+                ratings = get_ratings_by_movie_ids(
+                    [movie["id"] for movie in movie_rows])
+
+                if not ratings["success"]:
+                    return ratings
+
+                for movie in movie_rows:
+                    movie["reviews"] = ratings["data"].get(movie["id"], [])
 
             return {
                 "success": True,
                 "error": None,
-                "data": movies_as_dicts
+                "data": movie_rows
             }
 
         return {
@@ -96,48 +177,23 @@ def get_movie_by_id(id: str) -> SQLOperationResult:
         SQLOperationResult: SQL Operation Result.
     """
     try:
-        sql = text("""
-            SELECT movies.*, genres.name
-            FROM movies
-            JOIN genres ON movies.genre_id = genres.id
-            WHERE movies.id = :id
-        """)
-        result = db.session.execute(sql, {"id": id})
+        result = db.session.execute(GET_MOVIE_BY_ID_SQL, {"id": id})
         movie = result.fetchone()
 
         if movie is not None:
-            movie_dict = {
-                "id": str(movie[0]),
-                "title": movie[1],
-                "description": movie[2],
-                "year": movie[3],
-                "genre_id": str(movie[4]),
-                "created_by": str(movie[5]),
-                "created_at": movie[6].isoformat(),
-                "updated_at": movie[7].isoformat(),
-                "genre": movie[8]
-            }
+            movie_row = MovieStatsRow(movie)
 
-            ratings = get_movie_ratings_by_id(movie_dict["id"])
+            ratings = get_movie_ratings_by_id(movie_row["id"])
 
             if ratings["success"]:
-                movie_dict["reviews"] = ratings["data"]
-                movie_dict["review_count"] = len(ratings["data"])
-
-                if movie_dict["review_count"] > 0:
-                    movie_dict["review_average"] = sum(
-                        [review["rating"] for review in ratings["data"]]) / len(ratings["data"])
-                else:
-                    movie_dict["review_average"] = None
+                movie_row["reviews"] = ratings["data"]
             else:
-                movie_dict["reviews"] = []
-                movie_dict["review_count"] = 0
-                movie_dict["review_average"] = None
+                movie_row["reviews"] = []
 
             return {
                 "success": True,
                 "error": None,
-                "data": movie_dict
+                "data": movie_row
             }
 
         return {
@@ -157,85 +213,37 @@ def get_movie_by_id(id: str) -> SQLOperationResult:
         }
 
 
-def delete_movie_by_id(id: str, as_admin: bool) -> SQLOperationResult:
-    """Function to delete a movie by its ID.
+def get_movie_header_by_id(id: str) -> SQLOperationResult:
+    """Function to retrieve a movie by its ID without its reviews.
 
     Args:
         id (str): Movie ID as a string.
-        as_admin (bool): Whether to delete the movie as an admin or not.
-        Note that This is determined by server-sided business logic in the route handler!
 
     Returns:
-        SQLOperationResult: SQL Operation Result.
+        SQLOperationResult: SQL Operation Result. Data is the movie details & rating statistics.
     """
     try:
-        movie = get_movie_by_id(id)
-
-        if movie["success"]:
-            ratings = get_movie_ratings_by_id(movie["data"]["id"])
-
-            # check if people have rated the movie
-            if ratings["success"]:
-                ratings_count = len(ratings["data"])
-
-                # movie has reviews, enter deletion logic
-                if ratings_count > 1:
-                    if as_admin:
-                        sql = text(
-                            "DELETE FROM movies WHERE id = :id")
-                        db.session.execute(sql, {"id": id})
-                        db.session.commit()
-
-                    else:
-                        return {
-                            "success": False,
-                            "error": "Movie has reviews from other people. Only an admin can delete this.",
-                            "data": None}
-
-                # if the only review is by the user itself, delete the movie
-                elif ratings_count == 1:
-                    if ratings["data"][0]["user_id"] == session["user_id"] or as_admin:
-                        sql = text(
-                            "DELETE FROM movies WHERE id = :id")
-                        db.session.execute(sql, {"id": id})
-                        db.session.commit()
-                    else:
-                        return {
-                            "success": False,
-                            "error": "Movie has reviews from other people. Only an admin can delete this.",
-                            "data": None}
-
-                # no reviews, delete the movie straight away
-                sql = text(
-                    "DELETE FROM movies WHERE id = :id")
-                db.session.execute(sql, {"id": id})
-                db.session.commit()
-
-                return {
-                    "success": True,
-                    "error": None,
-                    "data": None
-                }
-
-            sql = text(
-                "DELETE FROM movies WHERE id = :id")
-            db.session.execute(sql, {"id": id})
-            db.session.commit()
+        try:
+            UUID(id)
+            movie = db.session.execute(GET_MOVIE_BY_ID_SQL, {"id": id}).fetchone()
+        except ValueError:
+            movie = None
 
+        if movie is not None:
             return {
                 "success": True,
                 "error": None,
-                "data": None
+                "data": MovieStatsRow(movie)
             }
 
         return {
             "success": False,
-            "error": "Movie fetching with given ID was unsuccessful.",
+            "error": "No movies found.",
             "data": None
         }
 
     except Exception as e:
-        print("DB Function 'delete_movie_by_id()' failed.")
+        print("DB Function 'get_movie_header_by_id()' failed.")
         print(e)
 
         return {
@@ -245,45 +253,41 @@ def delete_movie_by_id(id: str, as_admin: bool) -> SQLOperationResult:
         }
 
 
-def add_movie(
-        title: str,
-        genre: str,
-        description: str,
-        year: int,
-        user_id: str) -> SQLOperationResult:
-    """Function to add a new movie to the database.
+def get_movie_detail_by_id(id: str) -> SQLOperationResult:
+    """Function to retrieve the details shown on the Movie page: the movie, its
+    rating statistics and the username of its creator (reviews are paginated,
+    see `get_movie_ratings_page`).
 
     Args:
-        title (str): Movie title as a string.
-        genre (str): Movie genre ID as a string.
-        description (str): Movie description as a string.
-        year (int): Movie release year as an integer.
-        user_id (str): User ID as a string.
+        id (str): Movie ID as a string.
 
     Returns:
-        SQLOperationResult: SQL Operation Result.
+        SQLOperationResult: SQL Operation Result. The creator's username is in
+        "created_by_user" ("N/A" if the user is gone).
     """
     try:
-        # incoming data has been already validated in the route
-        # it's safe to insert it into the database
-        sql = text(
-            "INSERT INTO movies (title, genre_id, description, year, created_by) VALUES (:title, :genre_id, :description, :year, :created_by)")
-        db.session.execute(sql,
-                           {"title": title,
-                            "genre_id": genre,
-                            "description": description,
-                            "year": year,
-                            "created_by": user_id})
-        db.session.commit()
+        try:
+            UUID(id)
+            movie = db.session.execute(
+                GET_MOVIE_DETAIL_BY_ID_SQL, {"id": id}).fetchone()
+        except ValueError:
+            movie = None
+
+        if movie is None:
+            return {
+                "success": False,
+                "error": "No movies found.",
+                "data": None
+            }
 
         return {
             "success": True,
             "error": None,
-            "data": None
+            "data": MovieDetailRow(movie)
         }
 
     except Exception as e:
-        print("DB Function 'add_movie()' failed.")
+        print("DB Function 'get_movie_detail_by_id()' failed.")
         print(e)
 
         return {
@@ -293,52 +297,59 @@ def add_movie(
         }
 
 
-def rate_movie(id: str, rating: int, comment: str,
-               user_id: str) -> SQLOperationResult:
-    """Function to rate a movie.
+def get_movies_by_ids(
+        ids: list[str],
+        include_reviews: bool = False) -> SQLOperationResult:
+    """Function to retrieve several movies by their IDs with a single query.
 
     Args:
-        id (str): Movie ID as a string.
-        rating (int): Rating as an integer (1-5).
-        comment (str): Comment as a string.
-        user_id (str): User ID as a string.
+        ids (list[str]): Movie IDs as strings.
+        include_reviews (bool): Whether to attach the full review list of each movie
+        (fetched with one extra query).
 
     Returns:
-        SQLOperationResult: SQL Operation Result.
+        SQLOperationResult: SQL Operation Result. Data is a list of movies in the
+        requested order. Unknown (or malformed) IDs are left out.
     """
     try:
-        # check if user has already reviewed the movie
-        sql = text(
-            "SELECT * FROM reviews WHERE movie_id = :movie_id AND user_id = :user_id")
-        result = db.session.execute(sql, {"movie_id": id, "user_id": user_id})
-        rating_exists = result.fetchone()
+        valid_ids = []
 
-        if rating_exists is not None:
+        for movie_id in ids:
+            try:
+                # canonical (lowercase) form, same as str() of the fetched IDs
+                valid_ids.append(str(UUID(movie_id)))
+            except (ValueError, TypeError, AttributeError):
+                pass
+
+        if not valid_ids:
             return {
-                "success": False,
-                "error": "User has already rated the movie.",
-                "data": None
+                "success": True,
+                "error": None,
+                "data": []
             }
 
-        # incoming data has been already validated in the route
-        # it's safe to insert it into the database
-        sql = text(
-            "INSERT INTO reviews (movie_id, user_id, rating, comment) VALUES (:movie_id, :user_id, :rating, :comment)")
-        db.session.execute(sql,
-                           {"movie_id": id,
-                            "user_id": user_id,
-                            "rating": rating,
-                            "comment": comment})
-        db.session.commit()
+        result = db.session.execute(GET_MOVIES_BY_IDS_SQL, {"movie_ids": valid_ids})
+        movies = result.fetchall()
+
+        movies_by_id = {movie["id"]: movie for movie in map_rows(MovieStatsRow, movies)}
+
+        if include_reviews:
+            ratings = get_ratings_by_movie_ids(list(movies_by_id))
+
+            if not ratings["success"]:
+                return ratings
+
+            for movie_id, movie in movies_by_id.items():
+                movie["reviews"] = ratings["data"].get(movie_id, [])
 
         return {
             "success": True,
             "error": None,
-            "data": None
+            "data": [movies_by_id[movie_id] for movie_id in valid_ids if movie_id in movies_by_id]
         }
 
     except Exception as e:
-        print("DB Function 'rate_movie()' failed.")
+        print("DB Function 'get_movies_by_ids()' failed.")
         print(e)
 
         return {
@@ -348,106 +359,77 @@ def rate_movie(id: str, rating: int, comment: str,
         }
 
 
-def edit_movie_by_id(
+def delete_movie_by_id(
         id: str,
-        title: str,
-        genre: str,
-        description: str,
-        year: int) -> SQLOperationResult:
-    """Function to edit a movie in the database.
+        user_id: str,
+        as_admin: bool) -> SQLOperationResult:
+    """Function to delete a movie by its ID.
+
+    Users can delete their own movies as long as nobody else has reviewed them;
+    admins can delete any movie. The movie row is locked first, which holds off
+    new reviews (their foreign key check waits for the lock), so the review check
+    of the DELETE can't miss a review added at the same time.
 
     Args:
-        title (str): Movie title as a string.
-        genre (str): Movie genre ID as a string.
-        description (str): Movie description as a string.
-        year (int): Movie release year as an integer.
+        id (str): Movie ID as a string.
+        user_id (str): ID of the user deleting the movie.
+        as_admin (bool): Whether to delete the movie as an admin or not.
+        Note that This is determined by server-sided business logic in the route handler!
 
     Returns:
-        SQLOperationResult: SQL Operation Result.
+        SQLOperationResult: SQL Operation Result. On refusal, the error tells why.
     """
     try:
-        # auth has been checked in the route
-        # incoming data has been already validated in the route
-        # it's safe to insert it into the database
-        sql = text(
-            "UPDATE movies SET title = :title, genre_id = :genre_id, description = :description, year = :year WHERE id = :id")
-        db.session.execute(sql,
-                           {"title": title,
-                            "genre_id": genre,
-                            "description": description,
-                            "year": year,
-                            "id": id})
-        db.session.commit()
+        try:
+            UUID(id)
+            movie = db.session.execute(LOCK_MOVIE_SQL, {"id": id}).fetchone()
+        except ValueError:
+            movie = None
 
-        return {
-            "success": True,
-            "error": None,
-            "data": None
-        }
-
-    except Exception as e:
-        print("DB Function 'edit_movie_by_id()' failed.")
-        print(e)
-
-        return {
-            "success": False,
-            "error": str(e),
-            "data": None
-        }
+        if movie is None:
+            db.session.rollback()
 
+            return {
+                "success": False,
+                "error": "No movies found.",
+                "data": None
+            }
 
-def get_movie_ratings_by_id(id: str) -> SQLOperationResult:
-    """Function to get all movie ratings.
+        if not as_admin and str(movie[0]) != user_id:
+            db.session.rollback()
 
-    Args:
-        id (str): Movie ID as a string.
+            return {
+                "success": False,
+                "error": "You are not allowed to delete this movie.",
+                "data": None
+            }
 
-    Returns:
-        SQLOperationResult: SQL Operation Result.
-    """
-    try:
-        sql = text("""
-            SELECT reviews.*, users.username AS username
-            FROM reviews
-            JOIN users ON reviews.user_id = users.id
-            WHERE reviews.movie_id = :movie_id
-        """)
-        result = db.session.execute(sql, {"movie_id": id})
-        ratings = result.fetchall()
-
-        if ratings is not None:
-            ratings_as_dicts = []
-
-            for rating in ratings:
-                rating_dict = {
-                    "id": str(rating[0]),
-                    "user_id": str(rating[1]),
-                    "movie_id": str(rating[2]),
-                    "rating": rating[3],
-                    "comment": rating[4],
-                    "created_at": rating[5].isoformat(),
-                    "updated_at": rating[6].isoformat(),
-                    "username": rating[7]
-                }
-
-                ratings_as_dicts.append(rating_dict)
+        result = db.session.execute(
+            DELETE_MOVIE_SQL, {"id": id, "user_id": user_id, "as_admin": as_admin})
+        deleted = result.fetchone()
+        db.session.commit()
 
+        if deleted is None:
             return {
-                "success": True,
-                "error": None,
-                "data": ratings_as_dicts
+                "success": False,
+                "error": "Movie has reviews from other people. Only an admin can delete this.",
+                "data": None
             }
 
+        bump_versions(id, deleted=True)
+
         return {
             "success": True,
-            "error": "No ratings found.",
-            "data": []
+            "error": None,
+            "data": None
         }
 
     except Exception as e:
-        print("DB Function 'get_movie_ratings_by_id()' failed.")
+        print("DB Function 'delete_movie_by_id()' failed.")
         print(e)
 
+        db.session.rollback()
+
         return {
             "success": False,
             "error": str(e),
@@ -455,46 +437,44 @@ def get_movie_ratings_by_id(id: str) -> SQLOperationResult:
         }
 
 
-def get_rating_by_id(id: str) -> SQLOperationResult:
-    """Function to get a rating by its ID.
+def add_movie(
+        title: str,
+        genre: str,
+        description: str,
+        year: int,
+        user_id: str) -> SQLOperationResult:
+    """Function to add a new movie to the database.
 
     Args:
-        id (str): Rating ID as a string.
+        title (str): Movie title as a string.
+        genre (str): Movie genre ID as a string.
+        description (str): Movie description as a string.
+        year (int): Movie release year as an integer.
+        user_id (str): User ID as a string.
 
     Returns:
         SQLOperationResult: SQL Operation Result.
     """
     try:
-        sql = text(
-            "SELECT * FROM reviews WHERE id = :id")
-        result = db.session.execute(sql, {"id": id})
-        rating = result.fetchone()
-
-        if rating is not None:
-            rating_dict = {
-                "id": str(rating[0]),
-                "user_id": str(rating[1]),
-                "movie_id": str(rating[2]),
-                "rating": rating[3],
-                "comment": rating[4],
-                "created_at": rating[5].isoformat(),
-                "updated_at": rating[6].isoformat()
-            }
-
-            return {
-                "success": True,
-                "error": None,
-                "data": rating_dict
-            }
+        # incoming data has been already validated in the route
+        # it's safe to insert it into the database
+        db.session.execute(INSERT_MOVIE_SQL,
+                           {"title": title,
+                            "genre_id": genre,
+                            "description": description,
+                            "year": year,
+                            "created_by": user_id})
+        db.session.commit()
+        bump_versions()
 
         return {
             "success": True,
-            "error": "No rating found.",
-            "data": []
+            "error": None,
+            "data": None
         }
 
     except Exception as e:
-        print("DB Function 'get_rating_by_id()' failed.")
+        print("DB Function 'add_movie()' failed.")
         print(e)
 
         return {
@@ -504,47 +484,44 @@ def get_rating_by_id(id: str) -> SQLOperationResult:
         }
 
 
-def delete_rating_by_id(id: str, as_admin: bool) -> SQLOperationResult:
-    """Function to permanently delete a rating by its ID.
+def edit_movie_by_id(
+        id: str,
+        title: str,
+        genre: str,
+        description: str,
+        year: int) -> SQLOperationResult:
+    """Function to edit a movie in the database.
 
     Args:
-        id (str): Rating ID as a string.
-        as_admin (bool): Whether to delete the rating as an admin or not.
-        Note: This is determined by server-sided business logic in the route handler!
+        title (str): Movie title as a string.
+        genre (str): Movie genre ID as a string.
+        description (str): Movie description as a string.
+        year (int): Movie release year as an integer.
 
     Returns:
         SQLOperationResult: SQL Operation Result.
     """
     try:
-        rating = get_rating_by_id(id)
-
-        if rating["success"]:
-            if rating["data"]["user_id"] == session["user_id"] or as_admin:
-                sql = text(
-                    "DELETE FROM reviews WHERE id = :id")
-                db.session.execute(sql, {"id": id})
-                db.session.commit()
-
-                return {
-                    "success": True,
-                    "error": None,
-                    "data": None
-                }
-
-            return {
-                "success": False,
-                "error": "You are not allowed to delete this review!",
-                "data": None
-            }
+        # auth has been checked in the route
+        # incoming data has been already validated in the route
+        # it's safe to insert it into the database
+        db.session.execute(UPDATE_MOVIE_SQL,
+                           {"title": title,
+                            "genre_id": genre,
+                            "description": description,
+                            "year": year,
+                            "id": id})
+        db.session.commit()
+        bump_versions(id)
 
         return {
-            "success": False,
-            "error": "Rating fetching with given ID was unsuccessful.",
+            "success": True,
+            "error": None,
             "data": None
         }
 
     except Exception as e:
-        print("DB Function 'delete_rating_by_id()' failed.")
+        print("DB Function 'edit_movie_by_id()' failed.")
         print(e)
 
         return {
@@ -0,0 +1,564 @@
+"""SQL module for review-related (rating-related) stuff."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+# pylint: disable=redefined-builtin
+# i want to use `id` as variable name but pylint ain't having it
+
+
+from os import getenv
+from uuid import UUID
+from flask import session
+from sqlalchemy import TextClause, text
+from db import db
+from structs import RatingRow, ReviewRow, SQLOperationResult, map_rows
+from utils.cache import TTLCache
+from utils.page_cache import bump_versions
+
+
+# built once at import time, see `sql.movies`
+
+GET_USER_MOVIE_RATING_SQL = text(
+    "SELECT * FROM reviews WHERE movie_id = :movie_id AND user_id = :user_id")
+
+# one review per user & movie is enforced by the unique index on (movie_id, user_id)
+INSERT_RATING_SQL = text("""
+    INSERT INTO reviews (movie_id, user_id, rating, comment)
+    VALUES (:movie_id, :user_id, :rating, :comment)
+    ON CONFLICT (movie_id, user_id) DO NOTHING
+    RETURNING id, TRUE
+""")
+
+# xmax is 0 only for rows the statement inserted (instead of updated)
+UPSERT_RATING_SQL = text("""
+    INSERT INTO reviews (movie_id, user_id, rating, comment)
+    VALUES (:movie_id, :user_id, :rating, :comment)
+    ON CONFLICT (movie_id, user_id) DO UPDATE
+    SET rating = EXCLUDED.rating, comment = EXCLUDED.comment
+    RETURNING id, xmax = 0
+""")
+
+GET_MOVIE_RATINGS_SQL = text("""
+    SELECT reviews.*, users.username AS username
+    FROM reviews
+    JOIN users ON reviews.user_id = users.id
+    WHERE reviews.movie_id = :movie_id
+""")
+
+# review list orders: sort key columns (with the type of their cursor value) and direction
+REVIEW_SORTS = {
+    "newest": ([("created_at", "TIMESTAMPTZ"), ("id", "UUID")], "DESC"),
+    "highest": ([("rating", "INT"), ("created_at", "TIMESTAMPTZ"), ("id", "UUID")], "DESC"),
+    "lowest": ([("rating", "INT"), ("created_at", "TIMESTAMPTZ"), ("id", "UUID")], "ASC")
+}
+
+
+def build_review_page_sql(sort: str, after: bool) -> TextClause:
+    """Function to build the statement for one page of a movie's reviews.
+
+    Args:
+        sort (str): Review order (key of `REVIEW_SORTS`).
+        after (bool): Whether the page continues after a cursor (`:after_<column>` binds).
+
+    Returns:
+        TextClause: SQL statement.
+    """
+    columns, direction = REVIEW_SORTS[sort]
+    keys = ", ".join(f"reviews.{column}" for column, _ in columns)
+    where = ""
+
+    if after:
+        values = ", ".join(
+            f"CAST(:after_{column} AS {cast})" for column, cast in columns)
+        where = f"AND ({keys}) {'<' if direction == 'DESC' else '>'} ({values})"
+
+    order = ", ".join(
+        f"reviews.{column} {direction}" for column, _ in columns)
+
+    return text(f"""
+        SELECT reviews.id, reviews.user_id, reviews.movie_id, reviews.rating, reviews.comment,
+            reviews.created_at, reviews.updated_at, users.username AS username
+        FROM reviews
+        JOIN users ON reviews.user_id = users.id
+        WHERE reviews.movie_id = :movie_id {where}
+        ORDER BY {order}
+        LIMIT :limit
+    """)
+
+
+# (sort, continues after a cursor) -> statement
+REVIEW_PAGE_SQL = {
+    (sort, after): build_review_page_sql(sort, after)
+    for sort in REVIEW_SORTS for after in (False, True)
+}
+
+GET_RATINGS_BY_MOVIE_IDS_SQL = text("""
+    SELECT reviews.*, users.username AS username
+    FROM reviews
+    JOIN users ON reviews.user_id = users.id
+    WHERE reviews.movie_id = ANY(CAST(:movie_ids AS UUID[]))
+""")
+
+GET_RATED_MOVIE_IDS_SQL = text(
+    "SELECT movie_id FROM reviews WHERE user_id = :user_id")
+
+GET_RATING_BY_ID_SQL = text(
+    "SELECT * FROM reviews WHERE id = :id")
+
+GET_RATINGS_BY_IDS_SQL = text("""
+    SELECT *
+    FROM reviews
+    WHERE id = ANY(CAST(:ids AS UUID[]))
+""")
+
+DELETE_RATING_SQL = text(
+    "DELETE FROM reviews WHERE id = :id")
+
+
+# IDs of the movies each user has rated, for the 'rated' flags of the pages
+rated_movies_cache = TTLCache(
+    int(getenv("RATED_MOVIES_CACHE_SIZE", "1024")),
+    float(getenv("RATED_MOVIES_CACHE_TTL", "300")))
+
+
+def rate_movie(id: str, rating: int, comment: str,
+               user_id: str, upsert: bool = False) -> SQLOperationResult:
+    """Function to rate a movie (with a single statement).
+
+    Args:
+        id (str): Movie ID as a string.
+        rating (int): Rating as an integer (1-10).
+        comment (str): Comment as a string.
+        user_id (str): User ID as a string.
+        upsert (bool): Whether to replace the user's existing rating of the movie, if any.
+        Otherwise rating a movie twice fails.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict with the rating "id"
+        and whether it was "created" (False if an existing rating was updated).
+    """
+    try:
+        # incoming data has been already validated in the route
+        # it's safe to insert it into the database
+        result = db.session.execute(UPSERT_RATING_SQL if upsert else INSERT_RATING_SQL,
+                                    {"movie_id": id,
+                                     "user_id": user_id,
+                                     "rating": rating,
+                                     "comment": comment})
+        review = result.fetchone()
+        db.session.commit()
+
+        if review is None:
+            return {
+                "success": False,
+                "error": "User has already rated the movie.",
+                "data": None
+            }
+
+        bump_versions(id)
+        update_rated_movie_ids(user_id, id, True)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": {
+                "id": str(review[0]),
+                "created": review[1]
+            }
+        }
+
+    except Exception as e:
+        print("DB Function 'rate_movie()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_movie_ratings_by_id(id: str) -> SQLOperationResult:
+    """Function to get all movie ratings.
+
+    Args:
+        id (str): Movie ID as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result.
+    """
+    try:
+        result = db.session.execute(GET_MOVIE_RATINGS_SQL, {"movie_id": id})
+        ratings = result.fetchall()
+
+        if ratings is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": map_rows(ReviewRow, ratings)
+            }
+
+        return {
+            "success": True,
+            "error": "No ratings found.",
+            "data": []
+        }
+
+    except Exception as e:
+        print("DB Function 'get_movie_ratings_by_id()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_movie_ratings_page(
+        id: str,
+        sort: str = "newest",
+        after: tuple | None = None,
+        limit: int = 20) -> SQLOperationResult:
+    """Function to get one page of a movie's ratings (keyset pagination).
+
+    Backed by the (movie_id, created_at, id) & (movie_id, rating, created_at, id)
+    indexes, so pages are equally fast however many ratings the movie has.
+
+    Args:
+        id (str): Movie ID as a string.
+        sort (str): "newest" (default), "highest" or "lowest" (ties newest/oldest first,
+        respectively).
+        after (tuple | None): Sort key of the last rating on the previous page,
+        as made by `review_sort_key`.
+        limit (int): Maximum amount of ratings to return.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a list of ratings.
+    """
+    try:
+        columns = REVIEW_SORTS[sort][0]
+        params = {"movie_id": id, "limit": limit}
+
+        if after is not None:
+            for (column, _), value in zip(columns, after):
+                params[f"after_{column}"] = value
+
+        result = db.session.execute(
+            REVIEW_PAGE_SQL[(sort, after is not None)], params)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": map_rows(ReviewRow, result.fetchall())
+        }
+
+    except Exception as e:
+        print("DB Function 'get_movie_ratings_page()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def review_sort_key(rating: dict, sort: str) -> tuple:
+    """Function to get the sort key of a rating (for `get_movie_ratings_page` cursors).
+
+    Args:
+        rating (dict): Rating as returned by `get_movie_ratings_page`.
+        sort (str): Review order.
+
+    Returns:
+        tuple: Sort key values.
+    """
+    return tuple(rating[column] for column, _ in REVIEW_SORTS[sort][0])
+
+
+def get_ratings_by_movie_ids(ids: list[str]) -> SQLOperationResult:
+    """Function to get the ratings of several movies with a single query.
+
+    Args:
+        ids (list[str]): Movie IDs as strings.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict mapping
+        each movie ID to its list of ratings (movies without ratings are left out).
+    """
+    try:
+        if not ids:
+            return {
+                "success": True,
+                "error": None,
+                "data": {}
+            }
+
+        result = db.session.execute(GET_RATINGS_BY_MOVIE_IDS_SQL, {"movie_ids": ids})
+        ratings = result.fetchall()
+
+        ratings_by_movie = {}
+
+        for rating in map_rows(ReviewRow, ratings):
+            ratings_by_movie.setdefault(rating["movie_id"], []).append(rating)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": ratings_by_movie
+        }
+
+    except Exception as e:
+        print("DB Function 'get_ratings_by_movie_ids()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_rated_movie_ids(user_id: str) -> SQLOperationResult:
+    """Function to get the IDs of all movies a user has rated.
+
+    Sets are kept in an in-process cache (`RATED_MOVIES_CACHE_SIZE` users,
+    `RATED_MOVIES_CACHE_TTL` seconds), which `rate_movie` & `delete_rating_by_id` keep up to date.
+
+    Args:
+        user_id (str): User ID as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a frozenset of movie IDs.
+    """
+    cached = rated_movies_cache.get(user_id)
+
+    if cached is not None:
+        return {
+            "success": True,
+            "error": None,
+            "data": cached
+        }
+
+    try:
+        result = db.session.execute(GET_RATED_MOVIE_IDS_SQL, {"user_id": user_id})
+        movie_ids = frozenset(str(row[0]) for row in result.fetchall())
+        rated_movies_cache.set(user_id, movie_ids)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": movie_ids
+        }
+
+    except Exception as e:
+        print("DB Function 'get_rated_movie_ids()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def update_rated_movie_ids(user_id: str, movie_id: str, rated: bool) -> None:
+    """Function to update the cached set of movies a user has rated after a write.
+
+    Args:
+        user_id (str): User ID as a string.
+        movie_id (str): Movie ID as a string.
+        rated (bool): Whether the user now has a rating of the movie.
+    """
+    cached = rated_movies_cache.get(user_id)
+
+    # nothing cached, the next read fetches a fresh set anyway
+    if cached is None:
+        return
+
+    movie_id = movie_id.lower()
+
+    if rated:
+        rated_movies_cache.set(user_id, cached | {movie_id})
+    else:
+        rated_movies_cache.set(user_id, cached - {movie_id})
+
+
+def get_rating_by_id(id: str) -> SQLOperationResult:
+    """Function to get a rating by its ID.
+
+    Args:
+        id (str): Rating ID as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result.
+    """
+    try:
+        result = db.session.execute(GET_RATING_BY_ID_SQL, {"id": id})
+        rating = result.fetchone()
+
+        if rating is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": RatingRow(rating)
+            }
+
+        return {
+            "success": True,
+            "error": "No rating found.",
+            "data": []
+        }
+
+    except Exception as e:
+        print("DB Function 'get_rating_by_id()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_user_movie_rating(movie_id: str, user_id: str) -> SQLOperationResult:
+    """Function to get a user's rating of a movie.
+
+    Args:
+        movie_id (str): Movie ID as a string.
+        user_id (str): User ID as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is None if the user hasn't rated the movie.
+    """
+    try:
+        result = db.session.execute(
+            GET_USER_MOVIE_RATING_SQL, {"movie_id": movie_id, "user_id": user_id})
+        rating = result.fetchone()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": RatingRow(rating) if rating is not None else None
+        }
+
+    except Exception as e:
+        print("DB Function 'get_user_movie_rating()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_ratings_by_ids(ids: list[str]) -> SQLOperationResult:
+    """Function to get several ratings by their IDs with a single query.
+
+    Args:
+        ids (list[str]): Rating IDs as strings.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict of ratings
+        keyed by ID as given (unknown or malformed IDs are left out).
+    """
+    try:
+        # canonical (lowercase) ID -> the IDs as they were asked for
+        requested_ids = {}
+
+        for rating_id in ids:
+            try:
+                requested_ids.setdefault(str(UUID(rating_id)), []).append(rating_id)
+            except (ValueError, TypeError, AttributeError):
+                pass
+
+        ratings_by_id = {}
+
+        if requested_ids:
+            result = db.session.execute(GET_RATINGS_BY_IDS_SQL, {"ids": list(requested_ids)})
+
+            for rating in map_rows(RatingRow, result.fetchall()):
+                for rating_id in requested_ids[rating["id"]]:
+                    ratings_by_id[rating_id] = rating
+
+        return {
+            "success": True,
+            "error": None,
+            "data": ratings_by_id
+        }
+
+    except Exception as e:
+        print("DB Function 'get_ratings_by_ids()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def delete_rating_by_id(
+        id: str,
+        as_admin: bool,
+        rating: SQLOperationResult | None = None) -> SQLOperationResult:
+    """Function to permanently delete a rating by its ID.
+
+    Args:
+        id (str): Rating ID as a string.
+        as_admin (bool): Whether to delete the rating as an admin or not.
+        Note: This is determined by server-sided business logic in the route handler!
+        rating (SQLOperationResult | None): Already loaded rating, if any.
+        Fetched with `get_rating_by_id` otherwise.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result.
+    """
+    try:
+        if rating is None:
+            rating = get_rating_by_id(id)
+
+        if rating["success"]:
+            if rating["data"]["user_id"] == session["user_id"] or as_admin:
+                db.session.execute(DELETE_RATING_SQL, {"id": id})
+                db.session.commit()
+                bump_versions(rating["data"]["movie_id"])
+                update_rated_movie_ids(
+                    rating["data"]["user_id"], rating["data"]["movie_id"], False)
+
+                return {
+                    "success": True,
+                    "error": None,
+                    "data": None
+                }
+
+            return {
+                "success": False,
+                "error": "You are not allowed to delete this review!",
+                "data": None
+            }
+
+        return {
+            "success": False,
+            "error": "Rating fetching with given ID was unsuccessful.",
+            "data": None
+        }
+
+    except Exception as e:
+        print("DB Function 'delete_rating_by_id()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
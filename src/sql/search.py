@@ -0,0 +1,245 @@
+"""SQL module for movie searches and saved search results (search result handles)."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+# pylint: disable=redefined-builtin
+# i want to use `id` as variable name but pylint ain't having it
+
+
+from uuid import UUID
+from sqlalchemy import text
+from db import db
+from structs import MovieRow, SQLOperationResult, map_rows
+
+
+def save_search_results(movie_ids: list[str]) -> SQLOperationResult:
+    """Function to store a list of search results server-side.
+
+    Handles older than a day are pruned on the way.
+
+    Args:
+        movie_ids (list[str]): Movie IDs (in result order) as strings.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the handle (ID) of the stored results.
+    """
+    try:
+        sql = text(
+            "DELETE FROM search_results WHERE created_at < NOW() - INTERVAL '1 day'")
+        db.session.execute(sql)
+
+        sql = text("""
+            INSERT INTO search_results (movie_ids)
+            VALUES (CAST(:movie_ids AS UUID[]))
+            RETURNING id
+        """)
+        result = db.session.execute(sql, {"movie_ids": movie_ids})
+        handle = result.fetchone()[0]
+        db.session.commit()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": str(handle)
+        }
+
+    except Exception as e:
+        print("DB Function 'save_search_results()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_search_results(id: str) -> SQLOperationResult:
+    """Function to retrieve stored search results by their handle.
+
+    Args:
+        id (str): Search result handle as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the list of movie IDs.
+    """
+    try:
+        try:
+            UUID(id)
+        except ValueError:
+            return {
+                "success": False,
+                "error": "Search results not found. They may have expired.",
+                "data": None
+            }
+
+        sql = text(
+            "SELECT movie_ids FROM search_results WHERE id = :id")
+        result = db.session.execute(sql, {"id": id})
+        search_results = result.fetchone()
+
+        if search_results is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": [str(movie_id) for movie_id in search_results[0]]
+            }
+
+        return {
+            "success": False,
+            "error": "Search results not found. They may have expired.",
+            "data": None
+        }
+
+    except Exception as e:
+        print("DB Function 'get_search_results()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def search_movie_ids(
+        title: str | None,
+        genre: str | None,
+        limit: int) -> SQLOperationResult:
+    """Function to search for movies by title (case-insensitive substring) and/or genre.
+
+    Title matching is backed by the trigram index on `movies.title`.
+
+    Args:
+        title (str | None): Part of the movie title to search for.
+        genre (str | None): Genre ID to filter with (exact match).
+        limit (int): Maximum amount of results.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a list of matching
+        movie IDs ordered by title.
+    """
+    try:
+        conditions = []
+        params = {"limit": limit}
+
+        if title:
+            # escape LIKE wildcards so that the input is matched literally
+            escaped = title.replace("\\", "\\\\").replace(
+                "%", "\\%").replace("_", "\\_")
+            conditions.append("title ILIKE :pattern")
+            params["pattern"] = f"%{escaped}%"
+
+        if genre:
+            try:
+                UUID(genre)
+            except ValueError:
+                # not a genre ID, can't match anything
+                return {
+                    "success": True,
+                    "error": None,
+                    "data": []
+                }
+
+            conditions.append("genre_id = :genre_id")
+            params["genre_id"] = genre
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        sql = text(f"""
+            SELECT id
+            FROM movies
+            {where}
+            ORDER BY title ASC
+            LIMIT :limit
+        """)
+        result = db.session.execute(sql, params)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": [str(row[0]) for row in result.fetchall()]
+        }
+
+    except Exception as e:
+        print("DB Function 'search_movie_ids()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def search_movies_full_text(
+        query: str,
+        genre: str | None,
+        limit: int,
+        offset: int) -> SQLOperationResult:
+    """Function to search for movies by keywords in their title and description.
+
+    Matching is done against the `search_vector` column (full-text index).
+    Results are ranked by relevance, title matches weighing more than description ones.
+
+    Args:
+        query (str): Search terms (web search syntax, e.g. `space -comedy "time travel"`).
+        genre (str | None): Genre ID to filter with (exact match).
+        limit (int): Maximum amount of results.
+        offset (int): Amount of results to skip (for pagination).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a list of movies
+        ordered by relevance.
+    """
+    try:
+        where = ""
+        params = {"query": query, "limit": limit, "offset": offset}
+
+        if genre:
+            try:
+                UUID(genre)
+            except ValueError:
+                # not a genre ID, can't match anything
+                return {
+                    "success": True,
+                    "error": None,
+                    "data": []
+                }
+
+            where = "AND movies.genre_id = :genre_id"
+            params["genre_id"] = genre
+
+        sql = text(f"""
+            SELECT movies.id, movies.title, movies.description, movies.year, movies.genre_id,
+                movies.created_by, movies.created_at, movies.updated_at,
+                genres.name AS genre_name,
+                COALESCE(movie_stats.review_count, 0) AS review_count,
+                movie_stats.rating_average AS review_average
+            FROM movies
+            CROSS JOIN websearch_to_tsquery('english', :query) AS query
+            JOIN genres ON movies.genre_id = genres.id
+            LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+            WHERE movies.search_vector @@ query {where}
+            ORDER BY ts_rank_cd(movies.search_vector, query) DESC, movies.title ASC
+            LIMIT :limit OFFSET :offset
+        """)
+        result = db.session.execute(sql, params)
+        movies = result.fetchall()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": map_rows(MovieRow, movies)
+        }
+
+    except Exception as e:
+        print("DB Function 'search_movies_full_text()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
@@ -0,0 +1,344 @@
+"""SQL module for the synthetic data of `flask seed`.
+
+Seeded users are named `seed_user_<n>`; seeded movies are the ones they
+created, and seeded reviews the ones they wrote. Rows are bulk-loaded with
+`COPY`, each batch in a transaction of its own."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+
+from csv import writer
+from io import StringIO
+from typing import Iterable
+from sqlalchemy import text
+from db import db
+from structs import SQLOperationResult
+from sql.users import invalidate_user_cache
+from utils.page_cache import bump_versions
+
+
+SEED_USERNAME_PREFIX = "seed_user_"
+
+# seeded usernames are the prefix & a number, matched with a regular expression
+# (in LIKE "_" matches any character, and e.g. "seed_user_bob" isn't seeded),
+# at most 9 digits so that the number always fits the INT cast
+SEED_USERNAME_PATTERN = f"^{SEED_USERNAME_PREFIX}[0-9]{{1,9}}$"
+
+# seeded movie titles end with " #<n>"
+SEED_TITLE_PATTERN = "#([0-9]+)$"
+
+SEED_USER_IDS_SQL = text("""
+    SELECT id FROM users
+    WHERE username ~ :pattern
+    ORDER BY CAST(substring(username FROM :index_start) AS INT) ASC
+""")
+
+SEED_MOVIES_SQL = text("""
+    SELECT movies.id, movies.created_at FROM movies
+    JOIN users ON movies.created_by = users.id
+    WHERE users.username ~ :pattern
+    ORDER BY CAST(substring(movies.title FROM :title_pattern) AS INT) ASC
+""")
+
+SEED_COUNTS_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM users WHERE username ~ :pattern),
+        (SELECT COUNT(*) FROM movies JOIN users ON movies.created_by = users.id
+         WHERE users.username ~ :pattern),
+        (SELECT COUNT(*) FROM reviews JOIN users ON reviews.user_id = users.id
+         WHERE users.username ~ :pattern)
+""")
+
+CREATE_REVIEW_SEED_SQL = text("""
+    CREATE TEMPORARY TABLE review_seed (
+        user_id UUID NOT NULL,
+        movie_id UUID NOT NULL,
+        rating INT NOT NULL,
+        comment VARCHAR(1250) NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL
+    ) ON COMMIT DROP
+""")
+
+# a user rates a movie only once, repeated pairs are dropped
+INSERT_SEEDED_REVIEWS_SQL = text("""
+    INSERT INTO reviews (user_id, movie_id, rating, comment, created_at, updated_at)
+    SELECT user_id, movie_id, rating, comment, created_at, created_at
+    FROM review_seed
+    ON CONFLICT (movie_id, user_id) DO NOTHING
+""")
+
+# the statistics are rebuilt once after seeding instead of row by row
+DISABLE_REVIEW_STATS_SQL = text(
+    "ALTER TABLE reviews DISABLE TRIGGER update_movie_stats_reviews")
+
+ENABLE_REVIEW_STATS_SQL = text(
+    "ALTER TABLE reviews ENABLE TRIGGER update_movie_stats_reviews")
+
+DELETE_SEEDED_MOVIES_SQL = text("""
+    DELETE FROM movies
+    USING users
+    WHERE movies.created_by = users.id AND users.username ~ :pattern
+""")
+
+DELETE_SEEDED_USERS_SQL = text(
+    "DELETE FROM users WHERE username ~ :pattern")
+
+
+def copy_rows(table: str, columns: list[str], rows: Iterable[tuple]) -> None:
+    """Function to load rows into a table with `COPY` (in the current transaction).
+
+    Args:
+        table (str): Table name.
+        columns (list[str]): Column names, in the order of the row values.
+        rows (Iterable[tuple]): Rows.
+    """
+    buffer = StringIO()
+    writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    # COPY isn't available through SQLAlchemy, use the driver (psycopg2) cursor
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.close()
+
+
+def get_seed_counts() -> SQLOperationResult:
+    """Function to count the seeded users, movies & reviews.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict with the amount
+        of "users", "movies" & "reviews".
+    """
+    try:
+        counts = db.session.execute(
+            SEED_COUNTS_SQL, {"pattern": SEED_USERNAME_PATTERN}).fetchone()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": {"users": counts[0], "movies": counts[1], "reviews": counts[2]}
+        }
+
+    except Exception as e:
+        print("DB Function 'get_seed_counts()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_seed_user_ids() -> SQLOperationResult:
+    """Function to list the IDs of the seeded users.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a list of IDs, ordered
+        by the number in the username.
+    """
+    try:
+        result = db.session.execute(SEED_USER_IDS_SQL, {
+            "pattern": SEED_USERNAME_PATTERN,
+            "index_start": len(SEED_USERNAME_PREFIX) + 1
+        })
+
+        return {
+            "success": True,
+            "error": None,
+            "data": [str(row[0]) for row in result.fetchall()]
+        }
+
+    except Exception as e:
+        print("DB Function 'get_seed_user_ids()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_seed_movies() -> SQLOperationResult:
+    """Function to list the seeded movies.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a list of (ID, created_at)
+        tuples, ordered by the number in the title.
+    """
+    try:
+        result = db.session.execute(SEED_MOVIES_SQL, {
+            "pattern": SEED_USERNAME_PATTERN,
+            "title_pattern": SEED_TITLE_PATTERN
+        })
+
+        return {
+            "success": True,
+            "error": None,
+            "data": [(str(row[0]), row[1]) for row in result.fetchall()]
+        }
+
+    except Exception as e:
+        print("DB Function 'get_seed_movies()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def insert_seed_users(users: list[tuple]) -> SQLOperationResult:
+    """Function to bulk-load a batch of users in one transaction.
+
+    Args:
+        users (list[tuple]): (username, password hash, created_at) of each user.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of users inserted.
+    """
+    try:
+        copy_rows("users", ["username", "password", "created_at", "updated_at"],
+                  (user + (user[2],) for user in users))
+        db.session.commit()
+        invalidate_user_cache()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": len(users)
+        }
+
+    except Exception as e:
+        print("DB Function 'insert_seed_users()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def insert_seed_movies(movies: list[tuple]) -> SQLOperationResult:
+    """Function to bulk-load a batch of movies in one transaction.
+
+    Args:
+        movies (list[tuple]): (title, description, year, genre ID, creator ID, created_at)
+        of each movie.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of movies inserted.
+    """
+    try:
+        copy_rows("movies", ["title", "description", "year", "genre_id", "created_by",
+                             "created_at", "updated_at"],
+                  (movie + (movie[5],) for movie in movies))
+        db.session.commit()
+        bump_versions()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": len(movies)
+        }
+
+    except Exception as e:
+        print("DB Function 'insert_seed_movies()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def insert_seed_reviews(reviews: list[tuple]) -> SQLOperationResult:
+    """Function to bulk-load a batch of reviews in one transaction.
+
+    The rows go through a staging table, so that reviews of a movie the user has
+    already rated are skipped. The `movie_stats` trigger is off while the batch
+    is inserted: call `rebuild_movie_stats` once all batches are in.
+
+    Args:
+        reviews (list[tuple]): (user ID, movie ID, rating, comment, created_at) of each review.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of reviews inserted.
+    """
+    try:
+        db.session.execute(CREATE_REVIEW_SEED_SQL)
+        copy_rows("review_seed", ["user_id", "movie_id", "rating", "comment", "created_at"],
+                  reviews)
+
+        db.session.execute(DISABLE_REVIEW_STATS_SQL)
+        result = db.session.execute(INSERT_SEEDED_REVIEWS_SQL)
+        db.session.execute(ENABLE_REVIEW_STATS_SQL)
+        db.session.commit()
+        bump_versions()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": result.rowcount
+        }
+
+    except Exception as e:
+        print("DB Function 'insert_seed_reviews()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def delete_seed_data() -> SQLOperationResult:
+    """Function to delete the seeded users along with their movies & reviews.
+
+    As with `insert_seed_reviews`, `rebuild_movie_stats` has to be called afterwards.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of users deleted.
+    """
+    try:
+        params = {"pattern": SEED_USERNAME_PATTERN}
+
+        db.session.execute(DISABLE_REVIEW_STATS_SQL)
+        # reviews go along with their movies & users (ON DELETE CASCADE)
+        db.session.execute(DELETE_SEEDED_MOVIES_SQL, params)
+        result = db.session.execute(DELETE_SEEDED_USERS_SQL, params)
+        db.session.execute(ENABLE_REVIEW_STATS_SQL)
+        db.session.commit()
+        bump_versions()
+        invalidate_user_cache()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": result.rowcount
+        }
+
+    except Exception as e:
+        print("DB Function 'delete_seed_data()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
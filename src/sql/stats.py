@@ -0,0 +1,60 @@
+"""SQL module for the per-movie rating statistics (the `movie_stats` table)."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+
+from sqlalchemy import text
+from db import db
+from structs import SQLOperationResult
+
+
+def rebuild_movie_stats() -> SQLOperationResult:
+    """Function to recompute the `movie_stats` table from the reviews table.
+
+    The triggers keep the table up to date on their own; this is meant for
+    backfills & repairs. Review writes are blocked while the rebuild runs.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the amount of movies rebuilt.
+    """
+    try:
+        histogram = ", ".join(
+            f"COUNT(reviews.id) FILTER (WHERE reviews.rating = {stars})"
+            for stars in range(1, 11))
+
+        db.session.execute(text("LOCK TABLE reviews IN SHARE MODE"))
+
+        sql = text(f"""
+            INSERT INTO movie_stats (movie_id, review_count, rating_sum, rating_histogram)
+            SELECT movies.id, COUNT(reviews.id), COALESCE(SUM(reviews.rating), 0),
+                CAST(ARRAY[{histogram}] AS INT[])
+            FROM movies
+            LEFT JOIN reviews ON reviews.movie_id = movies.id
+            GROUP BY movies.id
+            ON CONFLICT (movie_id) DO UPDATE
+            SET review_count = EXCLUDED.review_count,
+                rating_sum = EXCLUDED.rating_sum,
+                rating_histogram = EXCLUDED.rating_histogram,
+                updated_at = NOW()
+        """)
+        result = db.session.execute(sql)
+        db.session.commit()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": result.rowcount
+        }
+
+    except Exception as e:
+        print("DB Function 'rebuild_movie_stats()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
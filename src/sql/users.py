@@ -7,42 +7,89 @@
 # i want to use `id` as variable name but pylint ain't having it
 
 
-from os import urandom
+from os import getenv, urandom
+from uuid import UUID
 from flask import session
 from werkzeug.security import check_password_hash, generate_password_hash
 from sqlalchemy import text
 from db import db
-from structs import SQLOperationResult
+from structs import SQLOperationResult, UserRow, map_rows
+from utils.cache import TTLCache
+
+
+# looked up on nearly every authenticated route
+user_cache = TTLCache(
+    int(getenv("USER_CACHE_SIZE", "1024")),
+    float(getenv("USER_CACHE_TTL", "60")))
+
+
+# built once at import time, see `sql.movies`
+GET_USER_BY_ID_SQL = text(
+    "SELECT id, created_at, updated_at, username, is_admin FROM users WHERE id=:id")
+
+GET_USERS_BY_IDS_SQL = text("""
+    SELECT id, created_at, updated_at, username, is_admin
+    FROM users
+    WHERE id = ANY(CAST(:ids AS UUID[]))
+""")
+
+INSERT_USER_SQL = text(
+    "INSERT INTO users (username, password) VALUES (:username, :password) RETURNING id")
+
+GET_USER_BY_USERNAME_SQL = text(
+    "SELECT id, created_at, updated_at, password, is_admin FROM users WHERE username=:username")
+
+GET_USER_ID_BY_USERNAME_SQL = text(
+    "SELECT id FROM users WHERE username=:username")
+
+
+def invalidate_user_cache(id: str | None = None) -> None:
+    """Function to drop cached user rows. Call after any write to the users table.
+
+    Args:
+        id (str | None): User ID as a string. None drops every cached user.
+    """
+    if id is None:
+        user_cache.clear()
+    else:
+        user_cache.delete(id.lower())
 
 
 def get_user_by_id(id: str) -> SQLOperationResult:
     """Function to retrieve a user by their ID.
 
+    Users are served from an in-process LRU cache (`USER_CACHE_SIZE` entries,
+    `USER_CACHE_TTL` seconds) when possible. Writes to the users table drop the
+    affected entries with `invalidate_user_cache`.
+
     Args:
         id (str): User ID as a string.
 
     Returns:
         SQLOperationResult: SQL Operation Result.
     """
+    cached = user_cache.get(id.lower())
+
+    if cached is not None:
+        return {
+            "success": True,
+            "error": None,
+            "data": cached.copy()
+        }
+
     try:
-        sql = text(
-            "SELECT id, created_at, updated_at, username, is_admin FROM users WHERE id=:id")
-        result = db.session.execute(sql, {"id": id})
+        result = db.session.execute(GET_USER_BY_ID_SQL, {"id": id})
         user = result.fetchone()
 
         if user is not None:
-            user_dict = {
-                "id": id,
-                "created_at": user[1].isoformat(),
-                "updated_at": user[2].isoformat(),
-                "username": user[3],
-                "is_admin": user[4]
-            }
+            user_row = UserRow(user)
+
+            user_cache.set(id.lower(), user_row)
 
             return {
                 "success": True,
                 "error": None,
-                "data": user_dict
+                "data": user_row.copy()
             }
 
         return {
@@ -62,6 +109,110 @@ def get_user_by_id(id: str) -> SQLOperationResult:
         }
 
 
+def get_users_by_ids(ids: list[str]) -> SQLOperationResult:
+    """Function to retrieve several users by their IDs with a single query.
+
+    Users found in the user cache are not queried again.
+
+    Args:
+        ids (list[str]): User IDs as strings.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict of users keyed
+        by ID as given (unknown or malformed IDs are left out).
+    """
+    users_by_id = {}
+    # canonical (lowercase) ID -> the IDs as they were asked for
+    missing_ids = {}
+
+    for user_id in ids:
+        try:
+            key = str(UUID(user_id))
+        except (ValueError, TypeError, AttributeError):
+            # malformed IDs would fail the whole query
+            continue
+
+        cached = user_cache.get(key)
+
+        if cached is not None:
+            users_by_id[user_id] = cached.copy()
+        else:
+            missing_ids.setdefault(key, []).append(user_id)
+
+    if not missing_ids:
+        return {
+            "success": True,
+            "error": None,
+            "data": users_by_id
+        }
+
+    try:
+        result = db.session.execute(GET_USERS_BY_IDS_SQL, {"ids": list(missing_ids)})
+
+        for user in map_rows(UserRow, result.fetchall()):
+            user_cache.set(user["id"], user)
+
+            # keys are the IDs as they were asked for
+            for user_id in missing_ids[user["id"]]:
+                users_by_id[user_id] = user.copy()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": users_by_id
+        }
+
+    except Exception as e:
+        print("DB Function 'get_users_by_ids()' failed.")
+        print(e)
+
+        db.session.rollback()
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_user_id_by_username(username: str) -> SQLOperationResult:
+    """Function to look up the ID of a user by their username.
+
+    Args:
+        username (str): Username as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is the user ID as a string.
+    """
+    try:
+        result = db.session.execute(
+            GET_USER_ID_BY_USERNAME_SQL, {"username": username})
+        user = result.fetchone()
+
+        if user is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": str(user[0])
+            }
+
+        return {
+            "success": False,
+            "error": "No users found.",
+            "data": None
+        }
+
+    except Exception as e:
+        print("DB Function 'get_user_id_by_username()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
 def register(username: str, password: str) -> SQLOperationResult:
     """Function to register a new user.
 
@@ -70,21 +221,21 @@ def register(username: str, password: str) -> SQLOperationResult:
         password (str): Password (still in plaintext) as a string.
 
     Returns:
-        SQLOperationResult: SQL Operation Result.
+        SQLOperationResult: SQL Operation Result. Data is a dict with the "id" of the new user.
     """
     try:
         hashed_password = generate_password_hash(password)
 
-        sql = text(
-            "INSERT INTO users (username, password) VALUES (:username, :password)")
-        db.session.execute(
-            sql, {"username": username, "password": hashed_password})
+        result = db.session.execute(
+            INSERT_USER_SQL, {"username": username, "password": hashed_password})
+        user_id = str(result.fetchone()[0])
         db.session.commit()
 
+        # a new user can't be in the user cache yet, nothing to invalidate
         return {
             "success": True,
             "error": None,
-            "data": None
+            "data": {"id": user_id}
         }
 
     except Exception as e:
@@ -108,35 +259,27 @@ def login(username: str, password: str) -> SQLOperationResult:
     Returns:
         SQLOperationResult: SQL Operation Result.
     """
-    sql = text(
-        "SELECT id, created_at, updated_at, password, is_admin FROM users WHERE username=:username")
-    result = db.session.execute(sql, {"username": username})
+    result = db.session.execute(GET_USER_BY_USERNAME_SQL, {"username": username})
     user = result.fetchone()
 
-    if user is not None:
-        user_dict = {
-            "id": str(user[0]),
-            "created_at": user[1].isoformat(),
-            "password": user[3],
-            "updated_at": user[2].isoformat(),
-            "username": username,
-            "is_admin": user[4]
-        }
+    if user is not None and check_password_hash(user[3], password):
+        # same columns as `GET_USER_BY_ID_SQL`, the password hash stays out of the row
+        user_row = UserRow((user[0], user[1], user[2], username, user[4]))
 
-        if check_password_hash(user_dict["password"], password):
-            # initialize session
-            session["csrf_token"] = urandom(16).hex()
-            session["is_admin"] = user_dict["is_admin"]
-            session["user_id"] = user_dict["id"]
-            session["username"] = user_dict["username"]
+        # initialize session
+        session["csrf_token"] = urandom(16).hex()
+        session["is_admin"] = user_row["is_admin"]
+        session["user_id"] = user_row["id"]
+        session["username"] = user_row["username"]
 
-            del user_dict["password"]
+        # logging in refreshes the cached row as well
+        user_cache.set(user_row["id"], user_row)
 
-            return {
-                "success": True,
-                "error": None,
-                "data": user_dict
-            }
+        return {
+            "success": True,
+            "error": None,
+            "data": user_row.copy()
+        }
 
     return {
         "success": False,
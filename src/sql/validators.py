@@ -0,0 +1,188 @@
+"""SQL module for HTTP cache validators of the pages.
+
+A validator is a fingerprint of everything a page shows (built from the
+`updated_at` columns of the movies and of their `movie_stats` rows, which
+the triggers bump on every review write) plus the page's Last-Modified time.
+Computing one is much cheaper than rendering the page."""
+
+# pylint: disable=import-error
+# pylint: disable=broad-exception-caught
+
+# pylint: disable=redefined-builtin
+# i want to use `id` as variable name but pylint ain't having it
+
+
+from uuid import UUID
+from sqlalchemy import text
+from db import db
+from structs import SQLOperationResult
+
+
+def get_movie_list_validator(
+        after: tuple[str, str] | None,
+        limit: int) -> SQLOperationResult:
+    """Function to compute the validator of one page of the movie list.
+
+    Args:
+        after (tuple[str, str] | None): (title, ID) of the last movie on the previous page.
+        limit (int): Maximum amount of movies on the page (same as passed to `get_all_movies`).
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict with the
+        fingerprint ("validator") and the last modification time ("last_modified").
+    """
+    try:
+        where = ""
+        params = {"limit": limit}
+
+        if after is not None:
+            where = "WHERE (movies.title, movies.id) > (:after_title, CAST(:after_id AS UUID))"
+            params["after_title"], params["after_id"] = after
+
+        sql = text(f"""
+            SELECT
+                md5(COALESCE(string_agg(
+                    CONCAT_WS(':', page.id, page.updated_at, movie_stats.updated_at), ','
+                    ORDER BY page.title, page.id), '')),
+                MAX(GREATEST(page.updated_at, movie_stats.updated_at))
+            FROM (
+                SELECT movies.id, movies.title, movies.updated_at
+                FROM movies
+                {where}
+                ORDER BY movies.title ASC, movies.id ASC
+                LIMIT :limit
+            ) AS page
+            LEFT JOIN movie_stats ON movie_stats.movie_id = page.id
+        """)
+        result = db.session.execute(sql, params)
+        validator = result.fetchone()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": {
+                "validator": validator[0],
+                "last_modified": validator[1]
+            }
+        }
+
+    except Exception as e:
+        print("DB Function 'get_movie_list_validator()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_movie_validator(id: str) -> SQLOperationResult:
+    """Function to compute the validator of a movie page (details & reviews).
+
+    Args:
+        id (str): Movie ID as a string.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict with the
+        fingerprint ("validator") and the last modification time ("last_modified").
+    """
+    try:
+        UUID(id)
+    except ValueError:
+        # malformed IDs are unknown movies, not a DB failure
+        return {
+            "success": False,
+            "error": "No movies found.",
+            "data": None
+        }
+
+    try:
+        sql = text("""
+            SELECT movies.updated_at, movie_stats.updated_at
+            FROM movies
+            LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+            WHERE movies.id = :id
+        """)
+        result = db.session.execute(sql, {"id": id})
+        validator = result.fetchone()
+
+        if validator is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": {
+                    "validator": f"{validator[0].isoformat()}:{validator[1]}",
+                    "last_modified": max(
+                        timestamp for timestamp in validator if timestamp is not None)
+                }
+            }
+
+        return {
+            "success": False,
+            "error": "No movies found.",
+            "data": None
+        }
+
+    except Exception as e:
+        print("DB Function 'get_movie_validator()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
+
+
+def get_movies_validator(ids: list[str]) -> SQLOperationResult:
+    """Function to compute the validator of a list of movies (e.g. search results).
+
+    Args:
+        ids (list[str]): Movie IDs as strings.
+
+    Returns:
+        SQLOperationResult: SQL Operation Result. Data is a dict with the
+        fingerprint ("validator") and the last modification time ("last_modified").
+    """
+    try:
+        valid_ids = []
+
+        for movie_id in ids:
+            try:
+                valid_ids.append(str(UUID(movie_id)))
+            except (ValueError, TypeError, AttributeError):
+                pass
+
+        sql = text("""
+            SELECT
+                md5(COALESCE(string_agg(
+                    CONCAT_WS(':', movies.id, movies.updated_at, movie_stats.updated_at), ','
+                    ORDER BY movies.id), '')),
+                MAX(GREATEST(movies.updated_at, movie_stats.updated_at))
+            FROM movies
+            LEFT JOIN movie_stats ON movie_stats.movie_id = movies.id
+            WHERE movies.id = ANY(CAST(:movie_ids AS UUID[]))
+        """)
+        result = db.session.execute(sql, {"movie_ids": valid_ids})
+        validator = result.fetchone()
+
+        return {
+            "success": True,
+            "error": None,
+            "data": {
+                # result order is part of the page too
+                "validator": f"{validator[0]}:{','.join(valid_ids)}",
+                "last_modified": validator[1]
+            }
+        }
+
+    except Exception as e:
+        print("DB Function 'get_movies_validator()' failed.")
+        print(e)
+
+        return {
+            "success": False,
+            "error": str(e),
+            "data": None
+        }
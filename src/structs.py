@@ -1,7 +1,9 @@
 """Module for custom types & structs."""
 
 
-from typing import TypedDict
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Iterable, Sequence, TypedDict, TypeVar
 
 
 class SQLOperationResult(TypedDict):
@@ -9,3 +11,203 @@ class SQLOperationResult(TypedDict):
     success: bool
     error: str | None
     data: dict | list[dict] | None
+
+
+def format_id(value: Any) -> str:
+    """Function to format an ID (UUID) column.
+
+    Args:
+        value (Any): Column value.
+
+    Returns:
+        str: ID as a string.
+    """
+    return str(value)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Function to format a timestamp column.
+
+    Args:
+        value (datetime): Column value.
+
+    Returns:
+        str: Timestamp in ISO 8601 format.
+    """
+    return value.isoformat()
+
+
+class SQLRow(Mapping):
+    """Read-only view of a fetched row, keyed by column name.
+
+    Subclasses list their column names in `fields` (in SELECT order) and may
+    give a formatter for some of them in `formatters`. The row keeps the fetched
+    values as they are; ids & timestamps are only formatted when read, so
+    columns nobody looks at cost nothing.
+
+    Rows behave like the dicts the SQL functions used to return: `row["title"]`
+    in Python & Jinja, `in`, `get()`, `dict(row)`... Keys can be added (or
+    overridden) with `row["reviews"] = ...`, the fetched values are never touched.
+    """
+    __slots__ = ("_values", "_extra")
+
+    fields: tuple[str, ...] = ()
+    formatters: dict[str, Callable[[Any], Any]] = {}
+
+    # column name -> position, built for each subclass
+    _positions: dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._positions = {field: position for position, field in enumerate(cls.fields)}
+
+    def __init__(self, values: Sequence, extra: dict[str, Any] | None = None) -> None:
+        self._values = values
+        self._extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+
+        value = self._values[self._positions[key]]
+        formatter = self.formatters.get(key)
+
+        if formatter is None or value is None:
+            return value
+
+        return formatter(value)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._extra is None:
+            self._extra = {}
+
+        self._extra[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions or (self._extra is not None and key in self._extra)
+
+    def __iter__(self):
+        yield from self.fields
+
+        if self._extra is not None:
+            yield from (key for key in self._extra if key not in self._positions)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self) -> "SQLRow":
+        """Function to copy the row (the copy's added keys are its own).
+
+        Returns:
+            SQLRow: Copy of the row.
+        """
+        return type(self)(
+            self._values, dict(self._extra) if self._extra is not None else None)
+
+    def to_dict(self) -> dict:
+        """Function to convert the row into a plain dict (e.g. for JSON).
+
+        Returns:
+            dict: Formatted values keyed by column name.
+        """
+        return dict(self)
+
+
+class MovieRow(SQLRow):
+    """Movie with its genre name & rating statistics (see `MOVIE_LIST_SQL`)."""
+    __slots__ = ()
+
+    fields = ("id", "title", "description", "year", "genre_id", "created_by",
+              "created_at", "updated_at", "genre", "review_count", "review_average")
+    formatters = {
+        "id": format_id,
+        "genre_id": format_id,
+        "created_by": format_id,
+        "created_at": format_timestamp,
+        "updated_at": format_timestamp
+    }
+
+
+class MovieStatsRow(MovieRow):
+    """Movie with its rating histogram as well (see `GET_MOVIE_BY_ID_SQL`)."""
+    __slots__ = ()
+
+    fields = MovieRow.fields + ("rating_histogram",)
+
+
+class MovieDetailRow(MovieStatsRow):
+    """Movie with its rating histogram and creator's username (see `GET_MOVIE_DETAIL_BY_ID_SQL`)."""
+    __slots__ = ()
+
+    fields = MovieStatsRow.fields + ("created_by_user",)
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+
+        # the creator may have deleted their account
+        if key == "created_by_user" and value is None:
+            return "N/A"
+
+        return value
+
+
+class RatingRow(SQLRow):
+    """Rating as stored in the `reviews` table."""
+    __slots__ = ()
+
+    fields = ("id", "user_id", "movie_id", "rating", "comment", "created_at", "updated_at")
+    formatters = {
+        "id": format_id,
+        "user_id": format_id,
+        "movie_id": format_id,
+        "created_at": format_timestamp,
+        "updated_at": format_timestamp
+    }
+
+
+class ReviewRow(RatingRow):
+    """Rating with the username of its author."""
+    __slots__ = ()
+
+    fields = RatingRow.fields + ("username",)
+
+
+class UserRow(SQLRow):
+    """User without the password hash."""
+    __slots__ = ()
+
+    fields = ("id", "created_at", "updated_at", "username", "is_admin")
+    formatters = {
+        "id": format_id,
+        "created_at": format_timestamp,
+        "updated_at": format_timestamp
+    }
+
+
+class GenreRow(SQLRow):
+    """Genre."""
+    __slots__ = ()
+
+    fields = ("id", "name")
+    formatters = {
+        "id": format_id
+    }
+
+
+RowT = TypeVar("RowT", bound=SQLRow)
+
+
+def map_rows(row_class: type[RowT], rows: Iterable[Sequence]) -> list[RowT]:
+    """Function to wrap fetched rows into row structs.
+
+    Args:
+        row_class (type[RowT]): Row struct matching the columns of the query.
+        rows (Iterable[Sequence]): Fetched rows.
+
+    Returns:
+        list[RowT]: Row structs, in the same order.
+    """
+    return [row_class(row) for row in rows]
@@ -0,0 +1,153 @@
+"""Module for conditional GET handling (ETag / Last-Modified).
+
+Pages depend on the logged-in user as well, so the ETag is built from the
+page's data validator, the session values the templates use, and a hash of
+the templates themselves. `If-None-Match` takes precedence over
+`If-Modified-Since`, as in RFC 9110. Last-Modified has one-second
+resolution and doesn't notice deleted movies, so it is only a fallback for
+clients that don't send ETags."""
+
+# pylint: disable=import-error
+
+
+from datetime import datetime
+from hashlib import sha1
+from pathlib import Path
+from typing import Callable
+from flask import Response, make_response, request, session
+from app import app
+from structs import SQLOperationResult
+from utils.page_cache import get_cached_data, set_cached_data
+
+
+def _hash_templates() -> str:
+    digest = sha1()
+
+    for path in sorted(Path(app.root_path, app.template_folder).glob("*.html")):
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+# changes whenever the templates (and thus the rendered HTML) do
+TEMPLATES_HASH = _hash_templates()
+
+
+def make_etag(validator: str) -> str:
+    """Function to build the ETag of a page for the current session.
+
+    Args:
+        validator (str): Fingerprint of the data shown on the page.
+
+    Returns:
+        str: ETag value (without quotes).
+    """
+    session_values = [
+        str(session.get(key)) for key in (
+            "user_id",
+            "username",
+            "is_admin",
+            "csrf_token")]
+
+    return sha1(":".join([TEMPLATES_HASH, validator] + session_values).encode(
+        "utf-8")).hexdigest()
+
+
+def load_validator(
+        cache_key: tuple | None,
+        compute: Callable[[], SQLOperationResult]) -> dict | None:
+    """Function to get a page validator, going through the page cache.
+
+    Args:
+        cache_key (tuple | None): Page cache key (including data versions). None skips the cache.
+        compute (Callable[[], SQLOperationResult]): Function computing the validator
+        (from `sql.validators`).
+
+    Returns:
+        dict | None: Validator ("validator" & "last_modified"), or None if it couldn't be computed.
+    """
+    if cache_key is not None:
+        cached = get_cached_data(("validator",) + cache_key)
+
+        if cached is not None:
+            return cached
+
+    validator = compute()
+
+    if not validator["success"]:
+        print(validator["error"])
+        return None
+
+    if cache_key is not None:
+        set_cached_data(("validator",) + cache_key, validator["data"])
+
+    return validator["data"]
+
+
+def is_not_modified(etag: str, last_modified: datetime | None) -> bool:
+    """Function to check the conditional headers of the current request.
+
+    Args:
+        etag (str): Current ETag of the page.
+        last_modified (datetime | None): Current (whole second) last modification time of the page.
+
+    Returns:
+        bool: True if the client's copy is still fresh.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+
+    return False
+
+
+def conditional_page(
+        validator: dict | None,
+        render: Callable[[], str | Response]) -> Response:
+    """Function to answer a GET request with either 304 Not Modified or the rendered page.
+
+    `render` is only called when the client's copy is outdated (or missing).
+
+    Args:
+        validator (dict | None): Page validator from `sql.validators` ("validator" &
+        "last_modified"). None skips conditional handling (e.g. when the validator
+        couldn't be computed).
+        render (Callable[[], str | Response]): Function rendering the page.
+
+    Returns:
+        Response: Either an empty 304 response or the rendered page with validators attached.
+    """
+    # flash messages are shown only once, such responses can't be reused
+    if validator is None or "_flashes" in session:
+        return make_response(render())
+
+    etag = make_etag(validator["validator"])
+    last_modified = validator["last_modified"]
+
+    if last_modified is not None:
+        # HTTP dates have whole seconds
+        last_modified = last_modified.replace(microsecond=0)
+
+    if is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(render())
+
+    response.set_etag(etag)
+
+    if last_modified is not None:
+        response.last_modified = last_modified
+
+    # pages depend on the session cookie, so shared caches may only reuse anonymous ones
+    response.cache_control.no_cache = True
+
+    if "user_id" in session:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+
+    response.vary.add("Cookie")
+
+    return response
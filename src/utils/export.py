@@ -0,0 +1,69 @@
+"""Module for encoding streamed export rows as CSV or JSONL (optionally gzipped)."""
+
+
+import csv
+import json
+import zlib
+from io import StringIO
+from typing import Iterator
+
+
+# encoded rows are sent / written in chunks of about this size (bytes)
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def encode_rows(
+        rows: Iterator[dict],
+        file_format: str,
+        columns: list[str]) -> Iterator[bytes]:
+    """Function to encode rows as CSV (with a header row) or JSONL.
+
+    Args:
+        rows (Iterator[dict]): Rows keyed by column name.
+        file_format (str): "csv" or "jsonl".
+        columns (list[str]): Column names (CSV header & column order).
+
+    Yields:
+        bytes: UTF-8 encoded chunks of the file.
+    """
+    buffer = StringIO()
+    csv_writer = csv.writer(buffer)
+
+    if file_format == "csv":
+        csv_writer.writerow(columns)
+
+    for row in rows:
+        if file_format == "csv":
+            csv_writer.writerow([row[column] for column in columns])
+        else:
+            buffer.write(json.dumps(row) + "\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Function to gzip a stream of chunks on the fly.
+
+    Args:
+        chunks (Iterator[bytes]): Uncompressed chunks.
+
+    Yields:
+        bytes: Chunks of a gzip file.
+    """
+    # wbits 31 = gzip header & trailer
+    compressor = zlib.compressobj(wbits=31)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
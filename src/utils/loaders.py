@@ -0,0 +1,140 @@
+"""Module for request-scoped, DataLoader-style batching of lookups.
+
+Every request gets its own set of loaders (stored on `flask.g`). A loader
+remembers everything it has loaded during the request, so repeated lookups
+of the same key cost nothing, and the keys missing from a `load_many()` are
+fetched with one query."""
+
+# pylint: disable=import-error
+
+
+from typing import Callable, Hashable
+from uuid import UUID
+from flask import g
+from structs import SQLOperationResult
+from sql.movies import get_movies_by_ids
+from sql.ratings import get_ratings_by_ids
+from sql.users import get_users_by_ids
+
+
+class DataLoader:
+    """Deduplicating & batching loader for one entity type.
+
+    `batch_fn` receives a list of keys and returns an SQLOperationResult whose
+    data is a dict of the found entities keyed by the same keys.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            batch_fn: Callable[[list[Hashable]], SQLOperationResult]):
+        self.name = name
+        self._batch_fn = batch_fn
+        self._loaded = {}
+
+    def load_many(self, keys: list[Hashable]) -> SQLOperationResult:
+        """Function to load several entities (one query at most).
+
+        Args:
+            keys (list[Hashable]): Keys to load.
+
+        Returns:
+            SQLOperationResult: SQL Operation Result. Data is a list of the entities
+            in the given order (None for the ones that don't exist).
+        """
+        missing = list(dict.fromkeys(key for key in keys if key not in self._loaded))
+
+        if missing:
+            batch = self._batch_fn(missing)
+
+            if not batch["success"]:
+                return batch
+
+            for key in missing:
+                self._loaded[key] = batch["data"].get(key)
+
+        return {
+            "success": True,
+            "error": None,
+            "data": [self._loaded.get(key) for key in keys]
+        }
+
+    def load(self, key: Hashable) -> SQLOperationResult:
+        """Function to load a single entity.
+
+        Args:
+            key (Hashable): Key to load.
+
+        Returns:
+            SQLOperationResult: SQL Operation Result.
+        """
+        loaded = self.load_many([key])
+
+        if not loaded["success"]:
+            return loaded
+
+        if loaded["data"][0] is None:
+            return {
+                "success": False,
+                "error": f"No {self.name} with id '{key}'.",
+                "data": None
+            }
+
+        return {
+            "success": True,
+            "error": None,
+            "data": loaded["data"][0]
+        }
+
+
+class RequestLoaders:
+    """Set of loaders for one request.
+
+    Attributes:
+        users: Users by user ID.
+        movies: Movies (with their rating statistics) by movie ID.
+        reviews: Single reviews by review ID.
+    """
+
+    def __init__(self):
+        self.users = DataLoader("user", get_users_by_ids)
+        self.movies = DataLoader("movie", self._load_movies)
+        self.reviews = DataLoader("review", get_ratings_by_ids)
+
+    @staticmethod
+    def _load_movies(ids: list[str]) -> SQLOperationResult:
+        movies = get_movies_by_ids(ids)
+
+        if not movies["success"]:
+            return movies
+
+        movies_by_id = {movie["id"]: movie for movie in movies["data"]}
+        found = {}
+
+        # keys are the IDs as they were asked for
+        for movie_id in ids:
+            try:
+                movie = movies_by_id.get(str(UUID(movie_id)))
+            except (ValueError, TypeError, AttributeError):
+                movie = None
+
+            if movie is not None:
+                found[movie_id] = movie
+
+        return {
+            "success": True,
+            "error": None,
+            "data": found
+        }
+
+
+def get_loaders() -> RequestLoaders:
+    """Function to get the loaders of the current request (created on first use).
+
+    Returns:
+        RequestLoaders: Loaders of the current request.
+    """
+    if "loaders" not in g:
+        g.loaders = RequestLoaders()
+
+    return g.loaders
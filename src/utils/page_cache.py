@@ -0,0 +1,152 @@
+"""Module for the rendered-page cache of the index & movie pages.
+
+Cache keys include version counters of the data shown on the page. The write
+functions in `sql.movies` & `sql.ratings` bump the versions, which makes every
+cached copy of the affected pages unreachable (they then age out of the LRU).
+
+Whole pages are only cached for anonymous visitors without pending flash
+messages. Logged-in users share the cached page data, and the per-user bits
+(e.g. the 'rated' flag) are added on top of it for each request.
+
+The cache is per-process. Entries expire after `PAGE_CACHE_TTL` seconds
+(env, default 30), which bounds staleness when several worker processes
+serve the same database."""
+
+# pylint: disable=import-error
+
+
+from collections import OrderedDict
+from os import getenv
+from threading import Lock
+from typing import Any
+from flask import session
+from utils.cache import TTLCache
+
+
+page_cache = TTLCache(
+    int(getenv("PAGE_CACHE_SIZE", "512")),
+    float(getenv("PAGE_CACHE_TTL", "30")))
+
+# movies whose version is tracked (the most recently written ones), the rest
+# share the "untracked" version
+MAX_MOVIE_VERSIONS = 4096
+
+_versions_lock = Lock()
+_versions = {
+    "listing": 0,
+    "untracked": 0,
+    "movies": OrderedDict()
+}
+
+
+def listing_version() -> int:
+    """Function to get the version of the movie listing.
+
+    Returns:
+        int: Version counter, bumped on any movie or review write.
+    """
+    return _versions["listing"]
+
+
+def movie_version(movie_id: str) -> int:
+    """Function to get the version of a single movie (details & reviews).
+
+    Args:
+        movie_id (str): Movie ID as a string.
+
+    Returns:
+        int: Version counter of the movie.
+    """
+    return _versions["movies"].get(movie_id.lower(), _versions["untracked"])
+
+
+def bump_versions(movie_id: str | None = None, deleted: bool = False) -> None:
+    """Function to invalidate cached pages after a write.
+
+    Versions only ever grow: a written movie gets the new listing version, and
+    movies that stop being tracked (deleted, or pushed out by more recently
+    written ones) fall back to the "untracked" version, which is then raised
+    to the listing version as well.
+
+    Args:
+        movie_id (str | None): ID of the movie that was written to (or whose reviews were).
+        The listing is always invalidated.
+        deleted (bool): Whether the movie was deleted (its version is no longer tracked).
+    """
+    with _versions_lock:
+        _versions["listing"] += 1
+
+        if movie_id is None:
+            return
+
+        movies = _versions["movies"]
+        movies.pop(movie_id.lower(), None)
+
+        if deleted:
+            _versions["untracked"] = _versions["listing"]
+            return
+
+        movies[movie_id.lower()] = _versions["listing"]
+
+        if len(movies) > MAX_MOVIE_VERSIONS:
+            movies.popitem(last=False)
+            _versions["untracked"] = _versions["listing"]
+
+
+def is_shared_page_request() -> bool:
+    """Function to check whether the current request gets the same HTML as
+    any other anonymous visitor.
+
+    Returns:
+        bool: True if nobody is logged in and no flash messages are pending.
+    """
+    return "user_id" not in session and "_flashes" not in session
+
+
+def get_cached_page(key: tuple) -> str | None:
+    """Function to read a whole rendered page from the cache.
+
+    Args:
+        key (tuple): Cache key (route, parameters & data versions).
+
+    Returns:
+        str | None: Cached HTML, or None on a miss or if the request can't share pages.
+    """
+    if not is_shared_page_request():
+        return None
+
+    return page_cache.get(("html",) + key)
+
+
+def set_cached_page(key: tuple, html: str) -> None:
+    """Function to store a rendered page, if the request is allowed to share it.
+
+    Args:
+        key (tuple): Cache key (route, parameters & data versions).
+        html (str): Rendered page.
+    """
+    if is_shared_page_request():
+        page_cache.set(("html",) + key, html)
+
+
+def get_cached_data(key: tuple) -> Any:
+    """Function to read page data shared by all visitors.
+
+    Args:
+        key (tuple): Cache key (route, parameters & data versions).
+
+    Returns:
+        Any: Cached data, or None on a miss.
+    """
+    return page_cache.get(("data",) + key)
+
+
+def set_cached_data(key: tuple, data: Any) -> None:
+    """Function to store page data shared by all visitors. Stored data must not
+    be mutated afterwards; copy it before adding per-user bits.
+
+    Args:
+        key (tuple): Cache key (route, parameters & data versions).
+        data (Any): Data to cache.
+    """
+    page_cache.set(("data",) + key, data)
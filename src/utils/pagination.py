@@ -0,0 +1,50 @@
+"""Module for keyset pagination cursors.
+
+A cursor is the sort key of the last item on a page, serialized
+into an URL-safe string."""
+
+# pylint: disable=broad-exception-caught
+
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+
+def encode_cursor(*values: str | int) -> str:
+    """Function to encode a sort key into a cursor string.
+
+    Args:
+        *values (str | int): Sort key values of the last item on a page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+
+    return urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> tuple | None:
+    """Function to decode a cursor string back into a sort key.
+
+    Args:
+        cursor (str | None): Cursor string (e.g. from the query string).
+        size (int): Expected amount of values in the sort key.
+
+    Returns:
+        tuple | None: Sort key values, or None if the cursor is missing or malformed.
+    """
+    if not cursor or not isinstance(cursor, str):
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(padded.encode("ascii")))
+
+        if not isinstance(values, list) or len(values) != size:
+            return None
+
+        return tuple(values)
+
+    except Exception:
+        return None
@@ -0,0 +1,162 @@
+"""Module for the per-request SQL statistics.
+
+Cursor events of the engine count the statements of each request and time
+them. After the request, the count, the total DB time and the slowest
+statement are sent as a `Server-Timing` header and logged as one line of
+`key=value` pairs. Statements slower than `SQL_SLOW_QUERY_MS` (env, default
+200) are logged with their bind parameters, also outside of requests.
+
+Only the statements run before the response is returned are counted, the
+rows of a streamed response (e.g. the exports) are read afterwards."""
+
+# pylint: disable=import-error
+# pylint: disable=unused-argument
+# pylint: disable=too-many-arguments
+
+
+import logging
+from os import getenv
+from time import perf_counter
+from typing import Any
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import app
+
+
+SLOW_QUERY_MS = float(getenv("SQL_SLOW_QUERY_MS", "200"))
+SERVER_TIMING = getenv("SQL_SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# statements are shortened to this many characters in the request log line
+SQL_PREVIEW_LENGTH = 200
+
+# bind parameters with these in their name are not logged
+HIDDEN_PARAMS = ("password",)
+
+logger = logging.getLogger("rottenpotatoes.sql")
+logger.setLevel(getenv("SQL_LOG_LEVEL", "INFO").upper())
+
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+
+
+def _collapse(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def _hide_params(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {
+            key: "***" if any(hidden in key.lower() for hidden in HIDDEN_PARAMS) else value
+            for key, value in parameters.items()
+        }
+
+    if isinstance(parameters, list):
+        return [_hide_params(item) for item in parameters]
+
+    return parameters
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed_ms = (perf_counter() - conn.info["query_start"].pop()) * 1000
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "slow_query duration_ms=%.1f sql=%r params=%r",
+            elapsed_ms, _collapse(statement), _hide_params(parameters))
+
+    if not has_request_context() or "sql_stats" not in g:
+        return
+
+    stats = g.sql_stats
+    stats["queries"] += 1
+    stats["total_ms"] += elapsed_ms
+
+    if elapsed_ms > stats["slowest_ms"]:
+        stats["slowest_ms"] = elapsed_ms
+        stats["slowest_sql"] = statement
+
+
+def _handle_error(context) -> None:
+    # a failed statement never reaches after_cursor_execute
+    starts = context.connection.info.get("query_start") if context.connection else None
+
+    if starts:
+        starts.pop()
+
+
+def install_query_stats(engine: Engine) -> None:
+    """Function to start collecting the statistics of an engine's statements.
+
+    Args:
+        engine (Engine): SQLAlchemy engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def get_request_stats() -> dict | None:
+    """Function to get the SQL statistics of the current request so far.
+
+    Returns:
+        dict | None: "queries", "total_ms", "slowest_ms" & "slowest_sql", or None
+        outside of a request.
+    """
+    if not has_request_context():
+        return None
+
+    return g.get("sql_stats")
+
+
+@app.before_request
+def start_request_stats() -> None:
+    """Function to reset the SQL statistics at the start of a request."""
+    g.sql_stats = {
+        "queries": 0,
+        "total_ms": 0.0,
+        "slowest_ms": 0.0,
+        "slowest_sql": None,
+        "started_at": perf_counter()
+    }
+
+
+@app.after_request
+def report_request_stats(response: Response) -> Response:
+    """Function to add the Server-Timing header and log the SQL statistics of a request.
+
+    Args:
+        response (Response): Response of the request.
+
+    Returns:
+        Response: The same response.
+    """
+    stats = g.get("sql_stats")
+
+    if stats is None:
+        return response
+
+    app_ms = (perf_counter() - stats["started_at"]) * 1000
+
+    if SERVER_TIMING:
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats["total_ms"]:.1f};desc="{stats["queries"]} queries", '
+            f'db-slowest;dur={stats["slowest_ms"]:.1f}, app;dur={app_ms:.1f}')
+
+    slowest_sql = stats["slowest_sql"]
+
+    logger.info(
+        "request method=%s path=%s status=%d duration_ms=%.1f queries=%d db_ms=%.1f "
+        "slowest_ms=%.1f slowest_sql=%r",
+        request.method, request.path, response.status_code, app_ms, stats["queries"],
+        stats["total_ms"], stats["slowest_ms"],
+        _collapse(slowest_sql)[:SQL_PREVIEW_LENGTH] if slowest_sql else None)
+
+    return response
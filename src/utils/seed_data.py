@@ -0,0 +1,245 @@
+"""Module for generating the synthetic users, movies & reviews of `flask seed`.
+
+All randomness comes from `random.Random` instances seeded from the seed of the
+run, the kind of row and the index of the first row of the batch, so the same
+seed (and sequence of top-ups) always produces the same data."""
+
+
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from random import Random
+
+
+# movie popularity follows Zipf's law: the n-th most popular movie gets
+# reviews in proportion to 1 / n ^ ZIPF_EXPONENT
+ZIPF_EXPONENT = 1.0
+
+# average rating of the movies ~ N(7, 1.3), single ratings scatter around it
+MOVIE_QUALITY_MEAN = 7.0
+MOVIE_QUALITY_DEVIATION = 1.3
+RATING_DEVIATION = 1.6
+
+# distinct review comments to pick from (generating one per review is slow)
+COMMENT_POOL_SIZE = 5000
+
+# data is spread over the few years before a fixed date (not today, which
+# would change the data of a seed from day to day)
+SEED_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SEED_TIME_SPAN = timedelta(days=5 * 365)
+
+WORDS = [
+    "love", "war", "space", "robots", "pirates", "detective", "family", "summer",
+    "winter", "city", "island", "secret", "ghost", "dragon", "king", "queen",
+    "river", "night", "storm", "heist", "journey", "dream", "empire", "shadow",
+    "the", "a", "of", "and", "in", "with", "lost", "last", "first", "golden",
+    "silent", "broken", "wild", "dark", "bright", "little", "great", "strange"
+]
+
+REVIEW_WORDS = [
+    "great", "boring", "acting", "plot", "ending", "music", "loved", "hated",
+    "the", "a", "was", "and", "really", "not", "too", "long", "short", "funny",
+    "sad", "scary", "beautiful", "slow", "fast", "twist", "cast", "story", "again"
+]
+
+
+def batch_random(seed: int, kind: str, start: int) -> Random:
+    """Function to get the random generator of a batch.
+
+    Args:
+        seed (int): Seed of the run.
+        kind (str): Kind of rows ("users", "movies", "reviews"...).
+        start (int): Index of the first row of the batch.
+
+    Returns:
+        Random: Random generator.
+    """
+    return Random(f"{seed}:{kind}:{start}")
+
+
+def random_text(rng: Random, words: list[str], length: int) -> str:
+    """Function to make up a sentence of roughly the given length.
+
+    Args:
+        rng (Random): Random generator.
+        words (list[str]): Words to pick from.
+        length (int): Length in characters (the result is at most this long).
+
+    Returns:
+        str: Capitalized sentence ending with a period.
+    """
+    picked = []
+    total = 0
+
+    while True:
+        word = rng.choice(words)
+
+        if total + len(word) + 2 > length and picked:
+            break
+
+        picked.append(word)
+        total += len(word) + 1
+
+    return " ".join(picked).capitalize()[:length - 1] + "."
+
+
+def random_length(rng: Random, median: int, minimum: int, maximum: int) -> int:
+    """Function to pick a text length from a log-normal distribution (a few long texts,
+    many short ones).
+
+    Args:
+        rng (Random): Random generator.
+        median (int): Median length.
+        minimum (int): Minimum length.
+        maximum (int): Maximum length.
+
+    Returns:
+        int: Length.
+    """
+    return max(minimum, min(maximum, int(rng.lognormvariate(0, 0.8) * median)))
+
+
+def random_time(rng: Random, after: datetime, now: datetime) -> datetime:
+    """Function to pick a point of time.
+
+    Args:
+        rng (Random): Random generator.
+        after (datetime): Earliest time.
+        now (datetime): Latest time.
+
+    Returns:
+        datetime: Time between the two.
+    """
+    return after + (now - after) * rng.random()
+
+
+def user_rows(
+        seed: int,
+        start: int,
+        count: int,
+        password_hash: str,
+        prefix: str,
+        now: datetime) -> list[tuple]:
+    """Function to generate a batch of users.
+
+    Args:
+        seed (int): Seed of the run.
+        start (int): Index of the first user.
+        count (int): Amount of users.
+        password_hash (str): Password hash shared by all users.
+        prefix (str): Username prefix (the index is appended).
+        now (datetime): Latest creation time.
+
+    Returns:
+        list[tuple]: (username, password hash, created_at) of each user.
+    """
+    rng = batch_random(seed, "users", start)
+
+    return [
+        (f"{prefix}{index}", password_hash, random_time(rng, now - SEED_TIME_SPAN, now))
+        for index in range(start, start + count)
+    ]
+
+
+def movie_rows(
+        seed: int,
+        start: int,
+        count: int,
+        genre_ids: list[str],
+        user_ids: list[str],
+        now: datetime) -> list[tuple]:
+    """Function to generate a batch of movies.
+
+    Titles end with " #<index>", which keeps them unique.
+
+    Args:
+        seed (int): Seed of the run.
+        start (int): Index of the first movie.
+        count (int): Amount of movies.
+        genre_ids (list[str]): Genres to pick from.
+        user_ids (list[str]): Creators to pick from.
+        now (datetime): Latest creation time.
+
+    Returns:
+        list[tuple]: (title, description, year, genre ID, creator ID, created_at) of each movie.
+    """
+    rng = batch_random(seed, "movies", start)
+    rows = []
+
+    for index in range(start, start + count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+
+        rows.append((
+            f"{title} #{index}",
+            random_text(rng, WORDS, random_length(rng, 200, 20, 1000)),
+            rng.randint(1920, now.year),
+            rng.choice(genre_ids),
+            rng.choice(user_ids),
+            random_time(rng, now - SEED_TIME_SPAN, now)
+        ))
+
+    return rows
+
+
+class ReviewGenerator:
+    """Generates reviews for a fixed set of movies & users.
+
+    Movies get a popularity rank and an average rating of their own (both drawn
+    from the seed, in movie order), so adding reviews later keeps the same
+    movies popular & well rated.
+    """
+
+    def __init__(
+            self,
+            seed: int,
+            movies: list[tuple[str, datetime]],
+            user_ids: list[str]) -> None:
+        rng = batch_random(seed, "movie-profiles", 0)
+
+        ranks = list(range(len(movies)))
+        rng.shuffle(ranks)
+
+        self.seed = seed
+        self.user_ids = user_ids
+        # most popular first
+        self.movies = [movies[index] for index in ranks]
+        self.qualities = [
+            rng.gauss(MOVIE_QUALITY_MEAN, MOVIE_QUALITY_DEVIATION) for _ in self.movies]
+        self.cum_weights = list(accumulate(
+            1 / rank ** ZIPF_EXPONENT for rank in range(1, len(movies) + 1)))
+        self.comments = [
+            random_text(rng, REVIEW_WORDS, random_length(rng, 80, 10, 1024))
+            for _ in range(COMMENT_POOL_SIZE)]
+
+    def rows(self, start: int, count: int, now: datetime, attempt: int = 0) -> list[tuple]:
+        """Function to generate a batch of reviews.
+
+        Some (user, movie) pairs may repeat, these are dropped when loading.
+
+        Args:
+            start (int): Amount of reviews seeded so far.
+            count (int): Amount of reviews.
+            now (datetime): Latest creation time.
+            attempt (int): Number of the try, for batches retried after adding nothing.
+
+        Returns:
+            list[tuple]: (user ID, movie ID, rating, comment, created_at) of each review.
+        """
+        rng = batch_random(self.seed, f"reviews-{attempt}", start)
+        total_weight = self.cum_weights[-1]
+        rows = []
+
+        for _ in range(count):
+            rank = bisect_left(self.cum_weights, rng.random() * total_weight)
+            movie_id, movie_created_at = self.movies[rank]
+            rating = round(rng.gauss(self.qualities[rank], RATING_DEVIATION))
+
+            rows.append((
+                rng.choice(self.user_ids),
+                movie_id,
+                max(1, min(10, rating)),
+                rng.choice(self.comments),
+                random_time(rng, movie_created_at, now)
+            ))
+
+        return rows
@@ -1,5 +1,5 @@
-"""Module to house the sanity-check-function to validate user input
-for adding/editing movies."""
+"""Module to house the sanity-check-functions to validate user input
+for adding/editing movies (and bulk imports)."""
 
 # pylint: disable=import-error
 # pylint: disable=broad-exception-caught
@@ -7,42 +7,32 @@ for adding/editing movies."""
 
 from datetime import datetime
 from flask import flash
-from sql.genres import get_all_genres
+from sql.genres import get_genre_ids
 
 
-def validate_movie_details(
+def check_movie_details(
         title: str,
         genre: str,
         description: str,
-        year: str) -> bool:
-    """Function to validate user input for adding/editing movies.
+        year: str,
+        genre_ids: frozenset[str]) -> str | None:
+    """Function to check movie details against the validation rules.
+
+    Doesn't touch the database or the session, so it can be run for any amount of rows.
 
     Args:
         title (str): Movie title as a string (4-64 chars)
-        genre (str): Movie genre ID as a string (checked against the genres table)
+        genre (str): Movie genre ID as a string (checked against `genre_ids`)
         description (str): Movie description as a string (4-1024 chars)
         year (str): Movie release year as a string (converted to an int later,
         acceptable: 1900 to current year)
+        genre_ids (frozenset[str]): IDs of all genres (see `sql.genres.get_genre_ids`)
 
     Returns:
-        bool: Whether or not the input is valid.
+        str | None: Error message, or None if the details are valid.
     """
-    genres = get_all_genres()
-
-    if not genres["success"]:
-        print(genres["error"])
-
-        flash(
-            "An error occurred while fetching genres. Please try again later.",
-            'error')
-
-        return False
-
-    genre_ids = [genre["id"] for genre in genres["data"]]
-
     if not title or not genre or not description or not year:
-        flash("Title, genre, description and year are required.", 'error')
-        return False
+        return "Title, genre, description and year are required."
 
     if not isinstance(
             title,
@@ -53,27 +43,63 @@ def validate_movie_details(
                 str) or not isinstance(
                     year,
             str):
-        flash("Title, genre, description and year must be of type string.", 'error')
-        return False
+        return "Title, genre, description and year must be of type string."
 
     if len(title) < 4 or len(title) > 64:
-        flash("Title must be between 4 and 64 characters.", 'error')
-        return False
+        return "Title must be between 4 and 64 characters."
 
     if len(description) < 4 or len(description) > 1024:
-        flash("Description must be between 4 and 1024 characters.", 'error')
-        return False
+        return "Description must be between 4 and 1024 characters."
 
     if genre not in genre_ids:
-        flash("Unknown genre.", 'error')
-        return False
+        return "Unknown genre."
 
-    year_as_int = int(year)
+    try:
+        year_as_int = int(year)
+    except ValueError:
+        return "Year must be a number."
 
     if year_as_int < 1900 or year_as_int > datetime.now().year:
+        return f"Year must be greater than 1900 and equal to or less than {datetime.now().year}."
+
+    return None
+
+
+def validate_movie_details(
+        title: str,
+        genre: str,
+        description: str,
+        year: str) -> bool:
+    """Function to validate user input for adding/editing movies.
+    Errors are flashed to the user.
+
+    Args:
+        title (str): Movie title as a string (4-64 chars)
+        genre (str): Movie genre ID as a string (checked against the genres table)
+        description (str): Movie description as a string (4-1024 chars)
+        year (str): Movie release year as a string (converted to an int later,
+        acceptable: 1900 to current year)
+
+    Returns:
+        bool: Whether or not the input is valid.
+    """
+    # served from the in-process genre cache
+    genre_ids = get_genre_ids()
+
+    if not genre_ids["success"]:
+        print(genre_ids["error"])
+
         flash(
-            f"Year must be greater than 1900 and equal to or less than {datetime.now().year}.",
+            "An error occurred while fetching genres. Please try again later.",
             'error')
+
+        return False
+
+    error = check_movie_details(
+        title, genre, description, year, genre_ids["data"])
+
+    if error is not None:
+        flash(error, 'error')
         return False
 
     return True